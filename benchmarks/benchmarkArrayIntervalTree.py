@@ -0,0 +1,66 @@
+import time
+import numpy as np
+
+from TreeDataStructure.src.IntervalTree import Interval
+from TreeDataStructure.src.IntervalTree_balanced import BalancedIntervalTree
+from TreeDataStructure.src.IntervalTree_parallel import ParallelQueryExecutor
+
+
+def main():
+    rng = np.random.default_rng(0)
+    n_intervals = 100_000
+    n_queries = 10_000
+
+    # Intervals shaped like hospital stays over ten years: admission day and a stay of a few days
+    lows = rng.integers(0, 3_650, n_intervals)
+    highs = lows + rng.integers(0, 15, n_intervals)
+
+    # ----------------------------------------------------------------------- #
+    #                   Build: per-row objects vs. columns
+    # ----------------------------------------------------------------------- #
+    start_time = time.time()
+    intervals = [Interval(int(low), int(high)) for low, high in zip(lows, highs)]
+    intervals.sort(key=lambda interval: interval.low)
+    tree = BalancedIntervalTree()
+    tree.root = tree.buildBalancedTree(intervals, start=0, end=len(intervals) - 1)
+    print(f"Interval objects + buildBalancedTree: {time.time() - start_time:.3f} seconds")
+
+    start_time = time.time()
+    frozen = BalancedIntervalTree.from_arrays(lows, highs)
+    print(f"from_arrays: {time.time() - start_time:.3f} seconds")
+
+    # Month-long query windows
+    query_lows = rng.integers(0, 3_650, n_queries)
+    query_highs = query_lows + 30
+
+    # ----------------------------------------------------------------------- #
+    #                   One query at a time (Node/Interval objects)
+    # ----------------------------------------------------------------------- #
+    start_time = time.time()
+    loop_matches = 0
+    for low, high in zip(query_lows.tolist(), query_highs.tolist()):
+        loop_matches += sum(1 for _ in tree.find_all_overlapping(Interval(low, high)))
+    loop_time = time.time() - start_time
+    print(f"find_all_overlapping loop: {loop_time:.3f} seconds ({loop_matches} matches)")
+
+    # ----------------------------------------------------------------------- #
+    #                   All queries at once (array-backed tree)
+    # ----------------------------------------------------------------------- #
+    start_time = time.time()
+    offsets, ids = frozen.query_many(query_lows, query_highs)
+    batch_time = time.time() - start_time
+    print(f"query_many: {batch_time:.3f} seconds ({len(ids)} matches)")
+    print(f"Speed-up: {loop_time / batch_time:.1f}x")
+
+    # ----------------------------------------------------------------------- #
+    #                   All queries at once, on every core
+    # ----------------------------------------------------------------------- #
+    with ParallelQueryExecutor(frozen) as executor:
+        start_time = time.time()
+        offsets, ids = executor.query_many(query_lows, query_highs)
+        parallel_time = time.time() - start_time
+    print(f"ParallelQueryExecutor.query_many: {parallel_time:.3f} seconds ({len(ids)} matches)")
+
+
+if __name__ == "__main__":
+    main()
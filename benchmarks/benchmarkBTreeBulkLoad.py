@@ -0,0 +1,30 @@
+import time
+
+from TreeDataStructure.src.BTree_BalancedTree import BTree
+
+
+def main():
+    n_keys = 1_000_000
+    items = [(key, 2 * key) for key in range(n_keys)]
+
+    # ----------------------------------------------------------------------- #
+    #                   Repeated inserts
+    # ----------------------------------------------------------------------- #
+    btree = BTree(min_degree=32)
+    start_time = time.perf_counter()
+    for item in items:
+        btree.insert(item)
+    print(f"{n_keys} inserts: {time.perf_counter() - start_time:.3f} seconds")
+
+    # ----------------------------------------------------------------------- #
+    #                   Bottom-up bulk load
+    # ----------------------------------------------------------------------- #
+    for fill_factor in (0.7, 1.0):
+        btree = BTree(min_degree=32)
+        start_time = time.perf_counter()
+        btree.bulk_load(items, fill_factor=fill_factor)
+        print(f"bulk_load(fill_factor={fill_factor}): {time.perf_counter() - start_time:.3f} seconds")
+
+
+if __name__ == "__main__":
+    main()
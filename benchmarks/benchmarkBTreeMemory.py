@@ -0,0 +1,41 @@
+import tracemalloc
+
+from TreeDataStructure.src.BTree_BalancedTree import BTree, BTreeNode
+
+
+class DictNode(BTreeNode):
+    """ A node with a per-instance __dict__, like BTreeNode before __slots__. """
+
+
+class DictNodeBTree(BTree):
+    node_class = DictNode
+
+
+def bytesPerKey(make_tree, n_keys):
+    """ Memory held by a tree of n_keys integer keys and values (traced by tracemalloc), divided by n_keys. """
+    tracemalloc.start()
+    start = tracemalloc.get_traced_memory()[0]
+    btree = make_tree()
+    # Keys and values are created while tracing (and large enough not to be cached small ints)
+    for key in range(n_keys):
+        btree.insert((1000 * key, 1000 * key + 1))
+    size = tracemalloc.get_traced_memory()[0] - start
+    tracemalloc.stop()
+    return size / n_keys
+
+
+def main():
+    n_keys = 200_000
+    layouts = {
+        "lists, __dict__ nodes": lambda: DictNodeBTree(min_degree=32),
+        "lists, __slots__ nodes": lambda: BTree(min_degree=32),
+        "array('q') keys and values": lambda: BTree(min_degree=32, key_typecode="q", value_typecode="q"),
+    }
+
+    print(f"{n_keys} int keys with int values (raw data: 16 bytes per pair)")
+    for name, make_tree in layouts.items():
+        print(f"{name:28s}: {bytesPerKey(make_tree, n_keys):6.1f} bytes per key")
+
+
+if __name__ == "__main__":
+    main()
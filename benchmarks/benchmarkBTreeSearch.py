@@ -0,0 +1,36 @@
+import time
+import random
+
+from TreeDataStructure.src.BTree_BalancedTree import BTree
+
+
+def main():
+    n_keys = 200_000
+    n_lookups = 100_000
+    keys = list(range(n_keys))
+    random.seed(0)
+    random.shuffle(keys)
+    lookups = random.sample(keys, n_lookups)
+
+    # Lookup time vs. min_degree: larger nodes mean fewer levels, and bisect keeps the cost inside a node O(log t)
+    print(f"{n_keys} keys, {n_lookups} lookups")
+    for min_degree in (2, 4, 8, 16, 32, 64, 128, 256):
+        btree = BTree(min_degree=min_degree)
+        for key in keys:
+            btree.insert((key, key))
+
+        start_time = time.perf_counter()
+        for key in lookups:
+            btree.search(key)
+        lookup_time = time.perf_counter() - start_time
+
+        # Same lookups as one batch: each node is visited once for all the probes that go through it
+        start_time = time.perf_counter()
+        btree.search_many(lookups)
+        batch_time = time.perf_counter() - start_time
+        print(f"min_degree={min_degree:4d}: {lookup_time:.3f} seconds ({1e6 * lookup_time / n_lookups:.2f} us per lookup), "
+              f"search_many {batch_time:.3f} seconds")
+
+
+if __name__ == "__main__":
+    main()
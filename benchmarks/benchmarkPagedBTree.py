@@ -0,0 +1,71 @@
+import os
+import random
+import tempfile
+import time
+
+from TreeDataStructure.src.BTree_Paged import PagedBTree
+
+
+def main():
+    n_keys = 200_000
+    n_searches = 50_000
+    random.seed(0)
+    keys = list(range(n_keys))
+    random.shuffle(keys)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "btree.pages")
+
+        # ----------------------------------------------------------------------- #
+        #                   Build (inserts) and save
+        # ----------------------------------------------------------------------- #
+        start_time = time.perf_counter()
+        with PagedBTree(path, cache_pages=1024) as btree:
+            for key in keys:
+                btree.insert((key, 2 * key))
+            print(f"{n_keys} inserts: {time.perf_counter() - start_time:.3f} seconds, "
+                  f"{btree.page_count} pages of {btree.page_size} bytes")
+
+        # ----------------------------------------------------------------------- #
+        #                   Reopen (nothing is rebuilt) and random searches
+        # ----------------------------------------------------------------------- #
+        for cache_pages in (16, 256, 4096):
+            start_time = time.perf_counter()
+            btree = PagedBTree(path, cache_pages=cache_pages)
+            open_time = time.perf_counter() - start_time
+
+            start_time = time.perf_counter()
+            for key in keys[:n_searches]:
+                btree.search(key)
+            print(f"cache_pages={cache_pages}: open {open_time * 1000:.2f} ms, "
+                  f"{n_searches} searches {time.perf_counter() - start_time:.3f} seconds")
+            btree.close()
+
+        # ----------------------------------------------------------------------- #
+        #                   Checkpoint cost grows with the changes, not the tree
+        # ----------------------------------------------------------------------- #
+        for n_changes in (10, 1000, 10000):
+            with PagedBTree(path, cache_pages=4096) as btree:
+                for key in range(n_keys, n_keys + n_changes):
+                    btree.insert((key, key))
+                start_time = time.perf_counter()
+                pages = btree.checkpoint()
+                print(f"checkpoint after {n_changes} inserts: {pages} pages, "
+                      f"{(time.perf_counter() - start_time) * 1000:.2f} ms")
+            n_keys += n_changes
+
+        # ----------------------------------------------------------------------- #
+        #                   Group commit: operations per fsync of the log
+        # ----------------------------------------------------------------------- #
+        for group_commit in (1, 16, 256):
+            with PagedBTree(path, cache_pages=4096, group_commit=group_commit) as btree:
+                start_time = time.perf_counter()
+                for key in range(n_keys, n_keys + 2000):
+                    btree.insert((key, key))
+                btree.commit()
+                print(f"group_commit={group_commit}: 2000 logged inserts {time.perf_counter() - start_time:.3f} seconds")
+            n_keys += 2000
+
+
+if __name__ == "__main__":
+    main()
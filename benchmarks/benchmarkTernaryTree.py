@@ -0,0 +1,61 @@
+import os
+import csv
+import time
+from datetime import date
+
+from TreeDataStructure.src.BanalancedTerbaryTree import Tree, Interval
+from TreeDataStructure.src.IntervalTree import Interval as BSTInterval
+from TreeDataStructure.src.IntervalTree_balanced import BalancedIntervalTree
+
+
+DATASET_DIR = os.path.join(os.path.dirname(__file__), "..", "tests", "test_hospitalDataset")
+
+
+def read_days(path, start_column, end_column):
+    """ Read [start, end] date columns as days since the first start date (missing end -> start). """
+    rows = []
+    with open(path, newline="") as f:
+        for row in csv.DictReader(f):
+            if not row[start_column]:
+                continue
+            start = date.fromisoformat(row[start_column])
+            end = date.fromisoformat(row[end_column]) if row[end_column] else start
+            rows.append((start, end))
+    reference_date = min(start for start, _ in rows)
+    return [((start - reference_date).days, (end - reference_date).days) for start, end in rows], reference_date
+
+
+def main():
+    admissions, reference_date = read_days(os.path.join(DATASET_DIR, "shuffled_HDHI.csv"), "D.O.A", "D.O.D")
+    queries = []
+    with open(os.path.join(DATASET_DIR, "mixed_interval_queries_10K.csv"), newline="") as f:
+        for row in csv.DictReader(f):
+            queries.append(((date.fromisoformat(row["start_date"]) - reference_date).days,
+                            (date.fromisoformat(row["end_date"]) - reference_date).days))
+    print(f"{len(admissions)} admissions, {len(queries)} queries")
+
+    # ----------------------------------------------------------------------- #
+    #                   Ternary Tree: tune max_entries
+    # ----------------------------------------------------------------------- #
+    ternary_tree = Tree(max_entries=16)
+    ternary_queries = [Interval(low, high) for low, high in queries]
+    timings = ternary_tree.tuneMaxEntries([Interval(low, high) for low, high in admissions], ternary_queries)
+    for max_entries, seconds in timings.items():
+        print(f"Ternary tree, max_entries={max_entries}: {seconds:.3f} seconds")
+    print(f"Best max_entries: {ternary_tree.max_entries}")
+
+    # ----------------------------------------------------------------------- #
+    #                   Balanced Interval Tree
+    # ----------------------------------------------------------------------- #
+    intervals = sorted((BSTInterval(low, high) for low, high in admissions), key=lambda interval: interval.low)
+    balanced_tree = BalancedIntervalTree()
+    balanced_tree.root = balanced_tree.buildBalancedTree(intervals, start=0, end=len(intervals) - 1)
+
+    start_time = time.perf_counter()
+    for low, high in queries:
+        list(balanced_tree.find_all_overlapping(BSTInterval(low, high)))
+    print(f"Balanced interval tree: {time.perf_counter() - start_time:.3f} seconds")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,8 @@
+import time
+
 from TreeDataStructure.src.BinaryTree import UnbalancedBinaryTree
 from TreeDataStructure.src.BinaryTree import BalancedBinaryTree
+from TreeDataStructure.src.BinaryTree import AVLBinaryTree
 
 
 def main():
@@ -30,6 +33,40 @@ def main():
     balanced_tree.preOrderTraversal(balanced_root, result)   # answer: 3 1 2 4 5
     print(result)
 
+    # ----------------------------------------------------------------------- #
+    #                   Self-balancing (AVL) Binary Search Tree
+    # ----------------------------------------------------------------------- #
+    # Sorted input is the worst case of the unbalanced tree (a chain, O(n) per insert)
+    n_elements = 100_000
+    avl_tree = AVLBinaryTree()
+    start_time = time.perf_counter()
+    for el in range(n_elements):
+        avl_tree.insert(el)
+    insert_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for el in range(n_elements):
+        avl_tree.search(el)
+    search_time = time.perf_counter() - start_time
+    print(f"\nAVL tree, {n_elements} sorted inserts: {insert_time:.3f} seconds (height {avl_tree.root.height}), "
+          f"{n_elements} searches: {search_time:.3f} seconds")
+
+    # ----------------------------------------------------------------------- #
+    #                   Scapegoat mode (partial rebuilds, no rotations)
+    # ----------------------------------------------------------------------- #
+    scapegoat_tree = BalancedBinaryTree(scapegoat=True)
+    start_time = time.perf_counter()
+    for el in range(n_elements):
+        scapegoat_tree.insert(el)
+    insert_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for el in range(n_elements):
+        scapegoat_tree.contains(el)
+    search_time = time.perf_counter() - start_time
+    print(f"Scapegoat tree (alpha={scapegoat_tree.alpha}), {n_elements} sorted inserts: {insert_time:.3f} seconds, "
+          f"{n_elements} searches: {search_time:.3f} seconds")
+
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,66 @@
+"""
+    AVL rotations shared by the self-balancing trees (AVLBinaryTree, BalancedIntervalTree(balance="avl")).
+
+    A rotation only changes the subtrees of the two rotated nodes, so only those two are recomputed, through the
+    _update hook of the tree: it recomputes a node from its children (height, and whatever the tree keeps per
+    subtree, such as size or max). Nodes need a height attribute.
+"""
+
+
+class AVLBalancing:
+    @staticmethod
+    def _height(node):
+        return node.height if node is not None else 0
+
+
+    def _update(self, node):
+        node.height = max(self._height(node.left), self._height(node.right)) + 1
+
+
+    def _rotateLeft(self, node):
+        r"""
+                node                 pivot
+               /    \               /     \
+              A    pivot    ->    node     C
+                   /   \         /    \
+                  B     C       A      B
+
+            Only node and pivot change their subtrees, so only they are updated
+            (node first, because it is now the child of pivot).
+        """
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+
+    def _rotateRight(self, node):
+        """ Mirror image of _rotateLeft. """
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        self._update(node)
+        self._update(pivot)
+        return pivot
+
+
+    def _rebalance(self, node):
+        """ Restore the AVL property (|height(left) - height(right)| <= 1) at node; returns the new subtree root. """
+        self._update(node)
+        balance = self._height(node.left) - self._height(node.right)
+
+        if balance > 1:
+            # Left-Right case: first turn it into a Left-Left case
+            if self._height(node.left.left) < self._height(node.left.right):
+                node.left = self._rotateLeft(node.left)
+            return self._rotateRight(node)
+
+        if balance < -1:
+            # Right-Left case: first turn it into a Right-Right case
+            if self._height(node.right.right) < self._height(node.right.left):
+                node.right = self._rotateRight(node.right)
+            return self._rotateLeft(node)
+
+        return node
@@ -0,0 +1,157 @@
+"""
+    B+ Tree:
+    A B+ tree is a B-tree where all the key-value pairs live in the leaves, and the leaves are linked together
+    in key order.
+
+    In a B+ tree:
+        1- Internal nodes only hold separator keys to route searches: children[i] holds the keys k with
+           keys[i - 1] <= k < keys[i].
+        2- Leaves hold the keys and their values (in two parallel lists), plus a next pointer to the leaf on
+           their right.
+        3- A range scan descends from the root once, to the leaf of its first key, and then just follows the
+           next pointers. Long scans read the leaves one after the other without going back up the tree.
+
+    Like BTree, nodes are split on the way down (before they are full), with min_degree t:
+        - a node holds at most 2t - 1 keys.
+        - a full leaf is split into t and t - 1 keys, and the first key of the right leaf is copied up as separator.
+        - a full internal node is split like in a B-tree: its middle key moves up.
+"""
+
+from bisect import bisect_left, bisect_right
+
+
+class BPlusTreeNode:
+    def __init__(self, is_leaf=None):
+        self.is_leaf = is_leaf
+        self.keys = []                   # separator keys (internal nodes) or keys (leaves)
+        self.values = []                 # values of the keys (leaves only)
+        self.children = []               # references to the children (internal nodes only)
+        self.next = None                 # the leaf on the right (leaves only)
+
+    def __repr__(self):
+        return f"Keys: {self.keys}, Leaf: {self.is_leaf}"
+
+
+
+class BPlusTree:
+    def __init__(self, min_degree):
+        """
+            Params:
+                - min_degree: Minimum degree of the B+ tree.
+        """
+        if min_degree < 2:
+            raise ValueError("min_degree must be at least 2")
+        self.root = BPlusTreeNode(is_leaf=True)
+        self.min_degree = min_degree
+        self.MAX_KEYS = (2 * min_degree) - 1
+
+
+    def insert(self, key):
+        """ Insert a (key, value) pair, splitting full nodes on the way down. """
+        root = self.root
+        if len(root.keys) == self.MAX_KEYS:
+            new_root = BPlusTreeNode(is_leaf=False)
+            new_root.children.append(root)
+            self.splitNode(new_root, 0)
+            self.root = new_root
+
+        key, value = key
+        node = self.root
+        while not node.is_leaf:
+            index = bisect_right(node.keys, key)
+            if len(node.children[index].keys) == self.MAX_KEYS:
+                self.splitNode(node, index)
+                if key >= node.keys[index]:
+                    index += 1
+            node = node.children[index]
+
+        index = bisect_right(node.keys, key)
+        node.keys.insert(index, key)
+        node.values.insert(index, value)
+
+
+    def splitNode(self, parent_node, node_index):
+        """ Split the full child parent_node.children[node_index] into two nodes. """
+        full_node = parent_node.children[node_index]
+        new_node = BPlusTreeNode(full_node.is_leaf)
+        t = self.min_degree
+
+        if full_node.is_leaf:
+            # The right leaf takes the upper t - 1 keys, its first key is copied up as separator
+            new_node.keys = full_node.keys[t:]
+            new_node.values = full_node.values[t:]
+            full_node.keys = full_node.keys[:t]
+            full_node.values = full_node.values[:t]
+            new_node.next = full_node.next
+            full_node.next = new_node
+            separator = new_node.keys[0]
+        else:
+            separator = full_node.keys[t - 1]
+            new_node.keys = full_node.keys[t:]
+            new_node.children = full_node.children[t:]
+            full_node.keys = full_node.keys[:t - 1]
+            full_node.children = full_node.children[:t]
+
+        parent_node.keys.insert(node_index, separator)
+        parent_node.children.insert(node_index + 1, new_node)
+
+
+    def _findLeaf(self, key):
+        """ Leftmost leaf that can hold key (keys equal to a separator can sit on both of its sides). """
+        node = self.root
+        while not node.is_leaf:
+            node = node.children[bisect_left(node.keys, key)]
+        return node
+
+
+    def search(self, search_key):
+        """
+            return:
+              - Tuple (leaf, index) where the key is found (its value is leaf.values[index]), or None if not found.
+        """
+        leaf = self._findLeaf(search_key)
+        while leaf is not None:
+            index = bisect_left(leaf.keys, search_key)
+            if index < len(leaf.keys):
+                return (leaf, index) if leaf.keys[index] == search_key else None
+            leaf = leaf.next        # every key of this leaf is smaller, the key can only be in the next one
+        return None
+
+
+    def items(self, from_key=None):
+        """
+            Lazily yield the key-value pairs in key order, starting at the first key >= from_key
+            (or at the smallest key if from_key is None): one descent, then a walk along the leaf chain.
+        """
+        if from_key is None:
+            leaf = self.root
+            while not leaf.is_leaf:
+                leaf = leaf.children[0]
+            index = 0
+        else:
+            leaf = self._findLeaf(from_key)
+            index = bisect_left(leaf.keys, from_key)
+
+        while leaf is not None:
+            for position in range(index, len(leaf.keys)):
+                yield leaf.keys[position], leaf.values[position]
+            leaf = leaf.next
+            index = 0
+
+
+    def range(self, low, high):
+        """ Lazily yield the key-value pairs with low <= key <= high, in key order. """
+        for key, value in self.items(low):
+            if key > high:
+                return
+            yield key, value
+
+
+    def printBPlusTree(self, node, level=0):
+        print("Level", level, ":", len(node.keys), "keys", end=" -> ")
+        for key in node.keys:
+            print(key, end=" ")
+        print()
+        level += 1
+        for child in node.children:
+            self.printBPlusTree(child, level)
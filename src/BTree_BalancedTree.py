@@ -18,14 +18,43 @@
         4- Height-Balanced: B-trees are always balanced, meaning that the paths from the root to any leaf node are of equal length.
         5- Efficient Disk Access: B-trees are optimized for reading/writing large blocks of data, making them ideal for databases and file systems.
 
+    Storage hooks:
+        The algorithms never follow node.children directly, they go through a few small methods:
+        newNode (allocate), child (follow a child reference), ref (reference to store in children),
+        markDirty (a node was modified) and freeNode (a node was unlinked from the tree).
+        In memory the references are the node objects themselves and the hooks are trivial; PagedBTree
+        (BTree_Paged.py) overrides them to keep the nodes in pages of a file.
+
+    Order statistics (optional, order_statistics=True):
+        Every internal node also keeps counts[i] = number of keys in the subtree of children[i], updated by
+        insertNonFull, splitNode and the delete helpers (borrow / merge move whole subtrees, so their counts move
+        with them). The number of keys before position i of a node is then i + sum(counts[:i]), which gives
+        rank(key), select(k) and count_range(low, high) with one descent, O(t * log_t n).
+
+    Node layout (struct of arrays):
+        Keys and values are kept in two parallel lists (keys[i] is the key of values[i]) instead of one list of
+        (key, value) tuples. Searches compare plain keys with bisect (binary search, O(log t) per node instead
+        of a linear O(t) scan) and never index into a tuple.
+        Nodes use __slots__ (no per-node __dict__). For numeric keys and values, key_typecode / value_typecode
+        (an array module typecode such as 'q' for 64-bit integers or 'd' for floats) store them in typed arrays
+        instead of lists: 8 bytes per key/value instead of a pointer plus a boxed int/float object. array supports
+        bisect, insert, pop and slicing like a list, so the algorithms are the same.
+
 """
 
+from array import array, typecodes
+from bisect import bisect_left, bisect_right
+
 
 class BTreeNode:
+    __slots__ = ("is_leaf", "keys", "values", "children", "counts")
+
     def __init__(self, is_leaf=None):
         self.is_leaf = is_leaf
-        self.keys = []                   # holds the keys (values) in the node
+        self.keys = []                   # holds the keys in the node (sorted)
+        self.values = []                 # holds the values of the keys (values[i] belongs to keys[i])
         self.children = []               # references to the children (subtrees)
+        self.counts = None               # counts[i]: number of keys under children[i] (a list with order_statistics)
 
     def __repr__(self):
         return f"Keys: {self.keys}, Leaf: {self.is_leaf}"
@@ -33,72 +62,114 @@ class BTreeNode:
 
 
 class BTree:
-    def __init__(self, min_degree):
+    node_class = BTreeNode
+    order_statistics = False
+    key_typecode = None
+    value_typecode = None
+
+    def __init__(self, min_degree, order_statistics=False, key_typecode=None, value_typecode=None):
         """
             BTree represents the entire B-tree structure.
             Params:
                 - min_degree: Minimum degree of the B-tree.
+                - order_statistics: Keep subtree counts, for rank / select / count_range / percentile.
+                - key_typecode, value_typecode: Store the keys / values of every node in an array of this typecode
+                                                (e.g. 'q' or 'd') instead of a list. None keeps lists (any type).
         """
-        self.root = BTreeNode(is_leaf=True)
+        for typecode in (key_typecode, value_typecode):
+            if typecode is not None and typecode not in typecodes:
+                raise ValueError(f"unknown array typecode {typecode!r}, use one of {typecodes!r}")
+        self.order_statistics = order_statistics
+        self.key_typecode = key_typecode
+        self.value_typecode = value_typecode
+        self.root = self.newNode(is_leaf=True)
         self.min_degree = min_degree             # Minimum degree of the B-tree
         self.MAX_KEYS = (2 * min_degree) - 1     # Maximum number of keys a node can have
         self.MIN_KEYS = min_degree - 1           # Minumum number of keys a node (except root) can have
 
 
+    # ----------------------------------------------------------------------- #
+    #                   Storage hooks
+    # ----------------------------------------------------------------------- #
+    def newNode(self, is_leaf):
+        node = self.node_class(is_leaf)
+        if self.order_statistics:
+            node.counts = []
+        if self.key_typecode is not None:
+            node.keys = array(self.key_typecode)
+        if self.value_typecode is not None:
+            node.values = array(self.value_typecode)
+        return node
+
+    def child(self, node, index):
+        """ The node referenced by node.children[index]. """
+        return node.children[index]
+
+    def ref(self, node):
+        """ What to store in a children list to reference node. """
+        return node
+
+    def markDirty(self, node):
+        """ Called after node was modified. """
+
+    def freeNode(self, node):
+        """ Called after node was unlinked from the tree (merged into its sibling, or an emptied root). """
+
+
     def insert(self, key):
         """
+             Insert a (key, value) pair.
              If root is full (more than MAX_KEYS), it needs to be split:
                Step 1: Create a new root node (empty)
                Step 2: Make the current root a child of the new root
                Step 3: Split the old root (now a child of the new root)
                Step 4: Insert the new key into the new root
         """
+        key, value = key
         root = self.root      # local variable
         if len(root.keys) == self.MAX_KEYS:    # Root is full, needs to split
-            new_root = BTreeNode(is_leaf=False)          # The new root will not be a leaf
-            new_root.children.insert(0, root)
+            new_root = self.newNode(is_leaf=False)       # The new root will not be a leaf
+            new_root.children.insert(0, self.ref(root))
+            if self.order_statistics:
+                new_root.counts.append(self._size(root))
             self.splitNode(new_root, 0)
-            self.insertNonFull(new_root, key)
+            self.insertNonFull(new_root, key, value)
             self.root = new_root  # Update root
         else:
-            self.insertNonFull(root, key)    # If the root is not full, insert the key into the non-full root
+            self.insertNonFull(root, key, value)    # If the root is not full, insert the key into the non-full root
 
 
-    def insertNonFull(self, node, key):
+    def insertNonFull(self, node, key, value):
         """
            Insert a key into a node that is not full.
            Params:
              - node: The node in which to insert the key (or recurse into)
-             - key: The key-value pair to be inserted into BTree.
+             - key, value: The key-value pair to be inserted into BTree.
 
-           - index: This tracks the position inside the keys list of the current node, starting from the rightmost
-                  key and moving left to find the correct position for the new key.
+           - index: The position of the new key inside the keys list of the current node, found with a binary search
+                  (after any equal keys, so equal keys keep their insertion order).
         """
-        index = len(node.keys) - 1    # Start at the rightmost key
+        index = bisect_right(node.keys, key)
 
         if node.is_leaf:
-            # If the node is a leaf, insert the key directly here
-            node.keys.append((None, None))
-            # goal of this loop: to maintain the sorted order
-            while index >= 0 and key[0] < node.keys[index][0]:
-                node.keys[index + 1] = node.keys[index]       # Shift the larger keys to the right
-                index -= 1
-            node.keys[index + 1] = key     # Insert the new key at the correct position
+            # If the node is a leaf, insert the key directly here (list.insert shifts the larger keys to the right)
+            node.keys.insert(index, key)
+            node.values.insert(index, value)
+            self.markDirty(node)
         else:
             # If the node is an internal node, we need to recurse into the correct child
-            while index >= 0 and key[0] < node.keys[index][0]:
-                index -= 1
-            index += 1
-
             # Check if the child is full
-            if len(node.children[index].keys) == self.MAX_KEYS:
+            if len(self.child(node, index).keys) == self.MAX_KEYS:
                 self.splitNode(node, index)
-                # After splitting, check if the key should go into the new child
-                if key[0] > node.keys[index][0]:
+                # After splitting, the key goes into the new (right) child if it is >= the promoted key, so that
+                # equal keys stay after the ones inserted before them
+                if key >= node.keys[index]:
                     index += 1
 
+            if self.order_statistics:
+                node.counts[index] += 1
             # Recur into the appropriate child to insert the key
-            self.insertNonFull(node.children[index], key)
+            self.insertNonFull(self.child(node, index), key, value)
 
 
     def splitNode(self, parent_node, node_index):
@@ -111,18 +182,280 @@ class BTree:
         - full_node: The child node that is full and needs to be split.
         - new_node: The new node that will hold the right half of the keys from the full child.
         """
-        full_node = parent_node.children[node_index]
-        new_node = BTreeNode(full_node.is_leaf)                    # Create a new node
-        parent_node.children.insert(node_index + 1, new_node)      # Insert the new child node
+        full_node = self.child(parent_node, node_index)
+        new_node = self.newNode(full_node.is_leaf)                    # Create a new node
+        parent_node.children.insert(node_index + 1, self.ref(new_node))      # Insert the new child node
         # Move the middle key of the full child up to the parent node
         parent_node.keys.insert(node_index, full_node.keys[self.min_degree - 1])
+        parent_node.values.insert(node_index, full_node.values[self.min_degree - 1])
         # Split the keys of the full child into two parts
         new_node.keys = full_node.keys[self.min_degree: self.MAX_KEYS]   # The new child gets the right half (keys greater than the middle key)
+        new_node.values = full_node.values[self.min_degree: self.MAX_KEYS]
         full_node.keys = full_node.keys[0: self.MIN_KEYS]                # The full child keeps the left half (keys less than the middle key)
+        full_node.values = full_node.values[0: self.MIN_KEYS]
 
         if not full_node.is_leaf:
             new_node.children = full_node.children[self.min_degree: (2 * self.min_degree)]  # Right half of the children
-            full_node.children = full_node.children[0: self.MIN_KEYS]   # Left half of the children
+            full_node.children = full_node.children[0: self.min_degree]   # Left half of the children
+            if self.order_statistics:
+                new_node.counts = full_node.counts[self.min_degree: (2 * self.min_degree)]
+                full_node.counts = full_node.counts[0: self.min_degree]
+
+        if self.order_statistics:
+            parent_node.counts[node_index] = self._size(full_node)
+            parent_node.counts.insert(node_index + 1, self._size(new_node))
+
+        self.markDirty(parent_node)
+        self.markDirty(full_node)
+        self.markDirty(new_node)
+
+
+    def bulk_load(self, sorted_items, fill_factor=0.7):
+        """
+            Replace the content of the tree with sorted_items, building it bottom-up in one linear pass instead of
+            n inserts (no descents, no splits).
+            Params:
+              - sorted_items: Iterable of (key, value) pairs sorted by key.
+              - fill_factor: Fraction of MAX_KEYS to put in each node (0 < fill_factor <= 1). The slack that is left
+                             absorbs later inserts without splitting.
+
+            Level by level, from the leaves up:
+              1- The keys of the level are cut into nodes of about fill_factor * MAX_KEYS keys, and the key between
+                 two consecutive nodes is kept aside as their separator.
+              2- The separators become the keys of the level above, whose nodes take the nodes just built as
+                 children (a node with c keys takes the next c + 1 children).
+              3- This stops when a level fits in a single node: the root.
+        """
+        if not 0 < fill_factor <= 1:
+            raise ValueError("fill_factor must be in (0, 1]")
+
+        keys, values = [], []
+        for key, value in sorted_items:
+            if keys and key < keys[-1]:
+                raise ValueError("bulk_load needs the items sorted by key")
+            keys.append(key)
+            values.append(value)
+
+        target = min(self.MAX_KEYS, max(self.MIN_KEYS, 1, round(fill_factor * self.MAX_KEYS)))
+        children = None         # references (self.ref) to the nodes of the level below, and their subtree sizes
+        while True:
+            refs, subtree_sizes = [], []
+            separator_keys, separator_values = [], []
+            position = 0
+            child = 0
+            sizes = self._bulkNodeSizes(len(keys), target)
+            for number, size in enumerate(sizes):
+                node = self.newNode(is_leaf=children is None)
+                node.keys.extend(keys[position: position + size])
+                node.values.extend(values[position: position + size])
+                position += size
+                if children is not None:
+                    node.children = children[child: child + size + 1]
+                    if self.order_statistics:
+                        node.counts = child_sizes[child: child + size + 1]
+                    child += size + 1
+                # Only a reference is kept: a finished node is not needed again (a paged tree can write it out)
+                refs.append(self.ref(node))
+                if self.order_statistics:
+                    subtree_sizes.append(self._size(node))
+
+                if number < len(sizes) - 1:
+                    separator_keys.append(keys[position])
+                    separator_values.append(values[position])
+                    position += 1
+
+            if len(sizes) == 1:
+                self.root = node
+                return
+            keys, values, children, child_sizes = separator_keys, separator_values, refs, subtree_sizes
+
+
+    def _bulkNodeSizes(self, n, target):
+        """
+            Number of keys of each node when n keys are cut into nodes of about target keys, with one separator
+            key between consecutive nodes. The sizes differ by at most one and every node gets between MIN_KEYS and
+            MAX_KEYS keys (a single node, the root, can have fewer).
+        """
+        count = -(-(n + 1) // (target + 1))                   # ceil((n + 1) / (target + 1)) nodes of ~target keys
+        count = max(1, min(count, (n + 1) // self.min_degree))   # but not so many that a node gets < MIN_KEYS keys
+        base, extra = divmod(n - (count - 1), count)
+        return [base + 1 if number < extra else base for number in range(count)]
+
+
+    def delete(self, key):
+        """
+            Delete the key-value pair with the given key (CLRS single-pass delete).
+            The descent never enters a node with only MIN_KEYS keys: before moving down, the child is given an extra
+            key by borrowing from a sibling or by merging it with a sibling (fillChild), so a key can always be
+            removed on the way down without walking back up. Cost O(t * log_t n).
+            Params:
+              - key: The key (without value) to delete.
+            return:
+              - True if a key-value pair was deleted, False if the key was not in the tree.
+        """
+        deleted = self._delete(self.root, key)
+
+        # Root collapse: a merge can take the last key of the root, then its only child becomes the root
+        root = self.root
+        if len(root.keys) == 0 and not root.is_leaf:
+            self.root = self.child(root, 0)
+            self.freeNode(root)
+        return deleted
+
+
+    def _delete(self, node, key):
+        index = bisect_left(node.keys, key)
+
+        if index < len(node.keys) and key == node.keys[index]:
+            if node.is_leaf:
+                # Case 1: the key is in a leaf, remove it
+                node.keys.pop(index)
+                node.values.pop(index)
+                self.markDirty(node)
+                return True
+
+            left_child, right_child = self.child(node, index), self.child(node, index + 1)
+            if len(left_child.keys) > self.MIN_KEYS:
+                # Case 2a: replace the key with its predecessor, deleted from the left child
+                node.keys[index], node.values[index] = self._popMax(left_child)
+            elif len(right_child.keys) > self.MIN_KEYS:
+                # Case 2b: replace the key with its successor, deleted from the right child
+                node.keys[index], node.values[index] = self._popMin(right_child)
+                index += 1
+            else:
+                # Case 2c: both children have MIN_KEYS keys, merge them around the key and delete it from there
+                self.mergeChildren(node, index)
+                self._delete(left_child, key)
+            if self.order_statistics:
+                node.counts[index] -= 1      # the subtree the key was taken from
+            self.markDirty(node)
+            return True
+
+        if node.is_leaf:
+            return False
+
+        # Case 3: the key can only be in the subtree of children[index], make sure it can spare a key first
+        index = self.fillChild(node, index)
+        deleted = self._delete(self.child(node, index), key)
+        if deleted and self.order_statistics:
+            node.counts[index] -= 1
+            self.markDirty(node)
+        return deleted
+
+
+    def _popMax(self, node):
+        """ Remove and return the largest key-value pair of the subtree rooted at node (node has > MIN_KEYS keys). """
+        while not node.is_leaf:
+            index = self.fillChild(node, len(node.children) - 1)
+            if self.order_statistics:
+                node.counts[index] -= 1
+                self.markDirty(node)
+            node = self.child(node, index)
+        self.markDirty(node)
+        return node.keys.pop(), node.values.pop()
+
+
+    def _popMin(self, node):
+        """ Remove and return the smallest key-value pair of the subtree rooted at node (node has > MIN_KEYS keys). """
+        while not node.is_leaf:
+            index = self.fillChild(node, 0)
+            if self.order_statistics:
+                node.counts[index] -= 1
+                self.markDirty(node)
+            node = self.child(node, index)
+        self.markDirty(node)
+        return node.keys.pop(0), node.values.pop(0)
+
+
+    def fillChild(self, parent_node, child_index):
+        """
+            Make sure parent_node.children[child_index] has more than MIN_KEYS keys before the delete moves into it.
+            return:
+              - The index of the child to move into (it changes when the child was merged into its left sibling).
+        """
+        child = self.child(parent_node, child_index)
+        if len(child.keys) > self.MIN_KEYS:
+            return child_index
+
+        if child_index > 0 and len(self.child(parent_node, child_index - 1).keys) > self.MIN_KEYS:
+            self.borrowFromLeft(parent_node, child_index)
+        elif child_index < len(parent_node.keys) and len(self.child(parent_node, child_index + 1).keys) > self.MIN_KEYS:
+            self.borrowFromRight(parent_node, child_index)
+        elif child_index < len(parent_node.keys):
+            self.mergeChildren(parent_node, child_index)
+        else:
+            self.mergeChildren(parent_node, child_index - 1)
+            child_index -= 1
+        return child_index
+
+
+    def borrowFromLeft(self, parent_node, child_index):
+        """
+            Rotate one key through the parent: the separator moves down to the front of the child and the last key
+            of the left sibling moves up to replace it (with its last child, for internal nodes).
+        """
+        child = self.child(parent_node, child_index)
+        sibling = self.child(parent_node, child_index - 1)
+
+        child.keys.insert(0, parent_node.keys[child_index - 1])
+        child.values.insert(0, parent_node.values[child_index - 1])
+        parent_node.keys[child_index - 1] = sibling.keys.pop()
+        parent_node.values[child_index - 1] = sibling.values.pop()
+        if not child.is_leaf:
+            child.children.insert(0, sibling.children.pop())
+        if self.order_statistics:
+            moved = sibling.counts.pop() if not child.is_leaf else 0
+            if not child.is_leaf:
+                child.counts.insert(0, moved)
+            parent_node.counts[child_index] += 1 + moved
+            parent_node.counts[child_index - 1] -= 1 + moved
+        self.markDirty(parent_node)
+        self.markDirty(child)
+        self.markDirty(sibling)
+
+
+    def borrowFromRight(self, parent_node, child_index):
+        """ Mirror image of borrowFromLeft. """
+        child = self.child(parent_node, child_index)
+        sibling = self.child(parent_node, child_index + 1)
+
+        child.keys.append(parent_node.keys[child_index])
+        child.values.append(parent_node.values[child_index])
+        parent_node.keys[child_index] = sibling.keys.pop(0)
+        parent_node.values[child_index] = sibling.values.pop(0)
+        if not child.is_leaf:
+            child.children.append(sibling.children.pop(0))
+        if self.order_statistics:
+            moved = sibling.counts.pop(0) if not child.is_leaf else 0
+            if not child.is_leaf:
+                child.counts.append(moved)
+            parent_node.counts[child_index] += 1 + moved
+            parent_node.counts[child_index + 1] -= 1 + moved
+        self.markDirty(parent_node)
+        self.markDirty(child)
+        self.markDirty(sibling)
+
+
+    def mergeChildren(self, parent_node, key_index):
+        """
+            Merge children[key_index + 1] and the separator keys[key_index] into children[key_index]
+            (the inverse of splitNode). Both children have MIN_KEYS keys, so the merged node has MAX_KEYS keys.
+        """
+        left_child = self.child(parent_node, key_index)
+        right_child = self.child(parent_node, key_index + 1)
+        parent_node.children.pop(key_index + 1)
+
+        left_child.keys.append(parent_node.keys.pop(key_index))
+        left_child.values.append(parent_node.values.pop(key_index))
+        left_child.keys.extend(right_child.keys)
+        left_child.values.extend(right_child.values)
+        left_child.children.extend(right_child.children)
+        if self.order_statistics:
+            left_child.counts.extend(right_child.counts)
+            parent_node.counts[key_index] += 1 + parent_node.counts.pop(key_index + 1)
+        self.markDirty(parent_node)
+        self.markDirty(left_child)
+        self.freeNode(right_child)
 
 
     def search(self, search_key, node=None):
@@ -132,30 +465,193 @@ class BTree:
               - search_key: The key being searched for in the B-tree.
               - current_node: The node where the search starts. If None, it starts from the root.
             return:
-              - Tuple (node, index) where the key is found, or None if not found.
+              - Tuple (node, index) where the key is found (node.keys[index] is the key and node.values[index]
+                its value), or None if not found.
         """
         if node is not None:
-            key_index = 0
-            while key_index < len(node.keys) and search_key > node.keys[key_index][0]:
-                key_index += 1
-            if key_index < len(node.keys) and search_key == node.keys[key_index][0]:
+            key_index = bisect_left(node.keys, search_key)
+            if key_index < len(node.keys) and search_key == node.keys[key_index]:
                 return node, key_index
             elif node.is_leaf:
                 return None
             else:
-                return self.search(search_key, node.children[key_index])
+                return self.search(search_key, self.child(node, key_index))
         else:
             # If no node is provided, start the search from the root
             return self.search(search_key, self.root)
 
 
+    def search_many(self, keys):
+        """
+            Batched search: look up many keys with a single descent of the tree.
+            The probes are sorted once, then every node visited gets a contiguous range of them. The range is cut
+            at the node's keys (two bisects per child that is entered): probes equal to a key are found in the
+            node, the others move down together to the child between the surrounding keys. A node is visited once
+            per batch instead of once per probe, and the walk uses an explicit stack instead of recursion.
+            Params:
+              - keys: Iterable of keys to look up.
+            return:
+              - List with, for each key (in the input order), what search(key) returns: (node, index) or None.
+        """
+        keys = list(keys)
+        order = sorted(range(len(keys)), key=keys.__getitem__)
+        probes = [keys[position] for position in order]
+        results = [None] * len(keys)
+
+        stack = [(self.root, 0, len(probes))] if probes else []
+        while stack:
+            node, start, end = stack.pop()
+            node_keys = node.keys
+            if node.is_leaf:
+                # Nothing below to hand probes to: a plain bisect per probe is cheaper than cutting the range
+                for position in range(start, end):
+                    probe = probes[position]
+                    index = bisect_left(node_keys, probe)
+                    if index < len(node_keys) and node_keys[index] == probe:
+                        results[order[position]] = (node, index)
+                continue
+
+            while start < end:
+                index = bisect_left(node_keys, probes[start])
+                if index == len(node_keys):
+                    stop = end
+                else:
+                    stop = bisect_left(probes, node_keys[index], start, end)
+
+                # probes[start:stop] lie strictly between node_keys[index - 1] and node_keys[index]
+                if stop > start:
+                    stack.append((self.child(node, index), start, stop))
+                start = stop
+
+                if index < len(node_keys):
+                    # probes[start:stop] are equal to node_keys[index]
+                    stop = bisect_right(probes, node_keys[index], start, end)
+                    for position in range(start, stop):
+                        results[order[position]] = (node, index)
+                    start = stop
+        return results
+
+
+    # ----------------------------------------------------------------------- #
+    #                   Order statistics (order_statistics=True)
+    # ----------------------------------------------------------------------- #
+    def _size(self, node):
+        """ Number of keys in the subtree rooted at node (from its counts, O(t)). """
+        return len(node.keys) + sum(node.counts)
+
+
+    def _checkOrderStatistics(self):
+        if not self.order_statistics:
+            raise ValueError("order statistics are not kept, create the tree with order_statistics=True")
+
+
+    def rank(self, key, inclusive=False):
+        """
+            Number of keys < key (<= key with inclusive=True), with a single descent: at every node, the keys left of
+            the position of key and the subtrees under them (their counts) are all smaller.
+        """
+        self._checkOrderStatistics()
+        find = bisect_right if inclusive else bisect_left
+        rank = 0
+        node = self.root
+        while True:
+            index = find(node.keys, key)
+            if node.is_leaf:
+                return rank + index
+            rank += index + sum(node.counts[:index])
+            node = self.child(node, index)
+
+
+    def select(self, k):
+        """
+            The k-th smallest (key, value) pair (k = 0 is the smallest). Negative k counts from the end, like a list
+            index. Raises IndexError when k is out of range.
+        """
+        self._checkOrderStatistics()
+        size = self._size(self.root)
+        if k < 0:
+            k += size
+        if not 0 <= k < size:
+            raise IndexError("select index out of range")
+
+        node = self.root
+        while not node.is_leaf:
+            for index, count in enumerate(node.counts):
+                if k < count:
+                    break               # in the subtree of children[index]
+                k -= count
+                if k == 0:
+                    return node.keys[index], node.values[index]
+                k -= 1
+            node = self.child(node, index)
+        return node.keys[k], node.values[k]
+
+
+    def count_range(self, low, high):
+        """ Number of keys with low <= key <= high. """
+        if high < low:
+            return 0
+        return self.rank(high, inclusive=True) - self.rank(low)
+
+
+    def percentile(self, p):
+        """ Nearest-rank percentile: the smallest key with at least p percent of the keys <= it (0 < p <= 100). """
+        self._checkOrderStatistics()
+        if not 0 < p <= 100:
+            raise ValueError("p must be in (0, 100]")
+        size = self._size(self.root)
+        return self.select(max(1, int(-(-p * size // 100))) - 1)[0]
+
+
+    def items(self, from_key=None):
+        """
+            Lazily yield the key-value pairs in key order, starting at the first key >= from_key
+            (or at the smallest key if from_key is None).
+            The walk is an in-order traversal with an explicit stack of (node, next key index) pairs, so it stops as
+            soon as the caller stops asking and never recurses. The tree must not be modified while iterating.
+        """
+        stack = []
+        node = self.root
+        while True:
+            index = 0 if from_key is None else bisect_left(node.keys, from_key)
+            stack.append((node, index))
+            if node.is_leaf:
+                break
+            node = self.child(node, index)
+
+        while stack:
+            node, index = stack.pop()
+            if node.is_leaf:
+                for position in range(index, len(node.keys)):
+                    yield node.keys[position], node.values[position]
+                continue
+
+            if index < len(node.keys):
+                yield node.keys[index], node.values[index]
+                stack.append((node, index + 1))
+                # Next comes the subtree right of the key, starting at its leftmost leaf
+                child = self.child(node, index + 1)
+                while True:
+                    stack.append((child, 0))
+                    if child.is_leaf:
+                        break
+                    child = self.child(child, 0)
+
+
+    def range(self, low, high):
+        """ Lazily yield the key-value pairs with low <= key <= high, in key order. """
+        for key, value in self.items(low):
+            if key > high:
+                return
+            yield key, value
+
+
     def printBTree(self, node, level=0):
         print("Level", level, ":", len(node.keys), "keys", end=" -> ")
-        for key in node.keys:
-            print(key, end=" ")
+        for key, value in zip(node.keys, node.values):
+            print((key, value), end=" ")
         print()
         level += 1
-        if len(node.children) > 0:
-            for child in node.children:
-                self.printBTree(child, level)
+        for index in range(len(node.children)):
+            self.printBTree(self.child(node, index), level)
 
@@ -0,0 +1,157 @@
+"""
+    Copy-on-write BTree: one writer and any number of lock-free readers.
+
+    Nodes reachable from a published root are never modified again. A write (insert, delete, bulk_load):
+        1- copies the root, and every node it reaches from there through child() (the path it walks down, plus
+           the siblings that splits, borrows and merges touch), so it only modifies private copies;
+        2- then publishes the new root with a single reference assignment.
+    The nodes the write did not reach are shared between the old and the new version of the tree.
+
+    Readers work on a snapshot: a read-only BTree over the root that was published when it was taken. Since
+    nothing reachable from that root changes, a snapshot stays consistent for as long as it is used, whatever
+    the writer does meanwhile, and reads never wait for writes. The read methods of the tree itself (search,
+    search_many, items, range and the order statistics) read from a fresh snapshot, so they can be called from
+    any thread.
+    Only one write runs at a time (writers take a lock; readers never do).
+"""
+
+import threading
+
+from TreeDataStructure.src.BTree_BalancedTree import BTree, BTreeNode
+
+
+class VersionedNode(BTreeNode):
+    __slots__ = ("version",)
+
+    def __init__(self, is_leaf=None, version=0):
+        super().__init__(is_leaf)
+        self.version = version           # the write that created the node: only that write may modify it
+
+
+class BTreeSnapshot(BTree):
+    def __init__(self, root, min_degree, order_statistics=False):
+        """ Read-only view of a BTree as of one published root. """
+        self.root = root
+        self.order_statistics = order_statistics
+        self.min_degree = min_degree
+        self.MAX_KEYS = (2 * min_degree) - 1
+        self.MIN_KEYS = min_degree - 1
+
+    def insert(self, key):
+        raise TypeError("a BTree snapshot is read-only")
+
+    def delete(self, key):
+        raise TypeError("a BTree snapshot is read-only")
+
+    def bulk_load(self, sorted_items, fill_factor=0.7):
+        raise TypeError("a BTree snapshot is read-only")
+
+
+class CopyOnWriteBTree(BTree):
+    node_class = VersionedNode
+
+    def __init__(self, min_degree, order_statistics=False, key_typecode=None, value_typecode=None):
+        self.version = 0                 # number of the current (or last) write
+        self._writer = None              # thread id of the running write, None between writes
+        self._write_lock = threading.Lock()
+        super().__init__(min_degree, order_statistics, key_typecode, value_typecode)
+        self.published_root = self.root  # root seen by readers; self.root is the writer's working root
+
+
+    def snapshot(self):
+        """ A consistent read-only view of the tree as it is now (O(1), nothing is copied). """
+        return BTreeSnapshot(self.published_root, self.min_degree, self.order_statistics)
+
+
+    # ----------------------------------------------------------------------- #
+    #                   Storage hooks
+    # ----------------------------------------------------------------------- #
+    def newNode(self, is_leaf):
+        node = super().newNode(is_leaf)
+        node.version = self.version
+        return node
+
+    def child(self, node, index):
+        """ In the writing thread, the child is replaced by a private copy (node itself already is one).
+            Other threads (e.g. search(key, node) or printBTree during a write) only read.
+        """
+        child = node.children[index]
+        if self._writer == threading.get_ident() and child.version != self.version:
+            child = self._copy(child)
+            node.children[index] = child
+        return child
+
+    def _copy(self, node):
+        copy = VersionedNode(node.is_leaf, self.version)
+        copy.keys = node.keys[:]
+        copy.values = node.values[:]
+        copy.children = node.children[:]
+        copy.counts = node.counts[:] if node.counts is not None else None
+        return copy
+
+
+    # ----------------------------------------------------------------------- #
+    #                   Writes
+    # ----------------------------------------------------------------------- #
+    def _write(self, operation, *args):
+        """ Run operation on a private copy of the root, then publish the new root. If operation fails, the
+            published tree is left as it was.
+        """
+        with self._write_lock:
+            self.version += 1
+            self._writer = threading.get_ident()
+            try:
+                self.root = self._copy(self.published_root)
+                result = operation(*args)
+            except BaseException:
+                self.root = self.published_root
+                raise
+            finally:
+                self._writer = None
+            self.published_root = self.root
+            return result
+
+
+    def insert(self, key):
+        self._write(super().insert, key)
+
+
+    def delete(self, key):
+        return self._write(super().delete, key)
+
+
+    def bulk_load(self, sorted_items, fill_factor=0.7):
+        self._write(super().bulk_load, sorted_items, fill_factor)
+
+
+    # ----------------------------------------------------------------------- #
+    #                   Reads (from a snapshot, safe from any thread)
+    # ----------------------------------------------------------------------- #
+    def search(self, search_key, node=None):
+        if node is None:
+            return self.snapshot().search(search_key)
+        return super().search(search_key, node)
+
+
+    def search_many(self, keys):
+        return self.snapshot().search_many(keys)
+
+
+    def items(self, from_key=None):
+        return self.snapshot().items(from_key)
+
+
+    def rank(self, key, inclusive=False):
+        return self.snapshot().rank(key, inclusive)
+
+
+    def select(self, k):
+        return self.snapshot().select(k)
+
+
+    def count_range(self, low, high):
+        return self.snapshot().count_range(low, high)
+
+
+    def percentile(self, p):
+        return self.snapshot().percentile(p)
@@ -0,0 +1,516 @@
+"""
+    Paged BTree: a BTree whose nodes live in fixed-size pages of a single file instead of in Python objects only.
+
+    File layout:
+        The file is an array of pages of page_size bytes; a node is stored in the page with its page id
+        (page id * page_size is the offset in the file). Children are referenced by page id.
+        1- Page 0 (meta page): magic, page_size, min_degree, root page id, number of pages, head of the free list.
+        2- Node page: [kind: 1 byte][n: 4 bytes][n keys][n values][n + 1 children (internal nodes only)],
+           keys, values and child ids are 64-bit integers.
+        3- Free page: a page released by a merge or a root collapse, [kind][0][next free page id]. Free pages
+           are chained from the meta page and reused before the file grows.
+        min_degree is limited by the page size: a node with MAX_KEYS keys must fit in one page.
+
+    Buffer pool:
+        Pages are read through a memory map of the file and decoded into nodes on first access. Clean nodes stay
+        in a bounded LRU cache; a node modified by insertNonFull, splitNode or a delete is marked dirty (markDirty)
+        and moved to the set of dirty pages, which is never evicted. The pool is trimmed back to cache_pages pages
+        at the end of every public operation (a single insert or delete touches at most about 3 nodes per level);
+        when the dirty pages alone exceed it, a checkpoint is taken, which makes them clean and evictable. This
+        keeps the memory bounded for trees larger than RAM.
+
+    Checkpoints and write-ahead log (path + ".wal"):
+        The page file only changes at checkpoints, so between two checkpoints it holds exactly the tree of the
+        last one, and every insert/delete done since then is appended to the write-ahead log as a small record.
+        1- Group commit: the records are buffered and written with a single fsync every group_commit operations
+           (or on commit()). A crash loses at most the operations that were not committed yet.
+        2- checkpoint() writes only the dirty pages and the meta page (the manifest: root, page count, free list):
+              - the page images and a commit record are appended to the log and fsynced,
+              - then they are written in place in the page file, which is synced,
+              - then the log is truncated.
+           Its cost is proportional to the number of pages changed since the previous checkpoint, not to the
+           size of the tree.
+        3- Recovery (when a non-empty log is found on open): the page images of a checkpoint whose commit record
+           made it to the log are written again (a crash in the middle of the in place writes is repaired), the
+           operations logged after it are replayed, and a new checkpoint is taken. A torn record at the end of
+           the log (crash during an append) ends it.
+
+    Opening an existing file only reads the meta page (and replays the log, if any): nothing is rebuilt,
+    nodes are loaded as they are visited.
+"""
+
+import mmap
+import os
+import struct
+import zlib
+from collections import OrderedDict
+
+from TreeDataStructure.src.BTree_BalancedTree import BTree, BTreeNode
+
+
+META = struct.Struct("<8sIIqqq")     # magic, page_size, min_degree, root id, page count, free list head
+PAGE_HEADER = struct.Struct("<BI")   # kind, number of keys
+MAGIC = b"PBTREE01"
+INTERNAL_PAGE, LEAF_PAGE, FREE_PAGE = 0, 1, 2
+NO_PAGE = -1
+
+LOG_HEADER = struct.Struct("<BI")    # record type, payload length; followed by the payload and its crc32
+LOG_CRC = struct.Struct("<I")
+INSERT_RECORD, DELETE_RECORD, PAGE_RECORD, COMMIT_RECORD = 1, 2, 3, 4
+INSERT_PAYLOAD = struct.Struct("<qq")     # key, value
+DELETE_PAYLOAD = struct.Struct("<q")      # key
+PAGE_PAYLOAD = struct.Struct("<q")        # page id, followed by the page image
+COMMIT_PAYLOAD = struct.Struct("<qqq")    # root id, page count, free list head
+
+
+class PagedBTreeNode(BTreeNode):
+    __slots__ = ("page_id", "dirty")
+
+    def __init__(self, is_leaf=None, page_id=None):
+        super().__init__(is_leaf)
+        self.page_id = page_id           # page of the file that holds the node
+        self.dirty = False               # modified since it was last written to its page
+
+
+class FreePage:
+    __slots__ = ("page_id", "next_page", "dirty")
+
+    def __init__(self, page_id, next_page):
+        self.page_id = page_id
+        self.next_page = next_page       # next page of the free list (NO_PAGE at the end)
+        self.dirty = False
+
+
+class PagedBTree(BTree):
+    def __init__(self, path, min_degree=None, page_size=4096, cache_pages=256, group_commit=64):
+        """
+            Open the paged BTree stored in path, or create it if the file does not exist (or is empty).
+            Params:
+              - path: The page file.
+              - min_degree: Minimum degree of a new tree. Defaults to the largest one that fits in a page. When an
+                            existing file is opened it is read from the file (passing a different one is an error).
+              - page_size: Page size in bytes of a new tree (an existing file keeps its own).
+              - cache_pages: Number of decoded pages kept in the buffer pool.
+              - group_commit: Number of inserts/deletes logged with a single fsync of the write-ahead log.
+        """
+        if cache_pages < 1:
+            raise ValueError("cache_pages must be at least 1")
+        if group_commit < 1:
+            raise ValueError("group_commit must be at least 1")
+        self.path = path
+        self.cache_pages = cache_pages
+        self.group_commit = group_commit
+        self.cache = OrderedDict()       # clean pages: page id -> PagedBTreeNode / FreePage, least recently used first
+        self.dirty_pages = {}            # pages modified since the last checkpoint, never evicted
+        self._log_buffer = bytearray()   # log records of the operations that are not committed yet
+        self._pending = 0                # number of operations in _log_buffer
+        self._recovering = False
+        self._loading = False            # inside bulk_load: finished pages can be written out (see newNode)
+
+        self._file = open(path, "a+b")
+        self._log = open(path + ".wal", "a+b")
+        try:
+            self._file.seek(0, os.SEEK_END)
+            if self._file.tell() == 0:
+                self._log.truncate(0)
+                self._create(min_degree, page_size)
+            else:
+                self._open(min_degree)
+                self._recover()
+        except BaseException:
+            self._file.close()
+            self._log.close()
+            raise
+
+
+    def _open(self, min_degree):
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        magic, self.page_size, stored_degree, self.root_id, self.page_count, self.free_head = META.unpack_from(self._map, 0)
+        if magic != MAGIC or (min_degree is not None and min_degree != stored_degree):
+            self._map.close()
+            if magic != MAGIC:
+                raise ValueError(f"{self.path} is not a paged BTree file")
+            raise ValueError(f"{self.path} was created with min_degree={stored_degree}, not {min_degree}")
+        self._setDegree(stored_degree)
+
+
+    def _create(self, min_degree, page_size):
+        largest = self.maxDegree(page_size)
+        if min_degree is None:
+            min_degree = largest
+        if not 2 <= min_degree <= largest:
+            raise ValueError(f"min_degree must be between 2 and {largest} for {page_size} byte pages")
+        self.page_size = page_size
+        self._setDegree(min_degree)
+
+        self._file.truncate(4 * page_size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+        self.page_count = 1              # the meta page
+        self.free_head = NO_PAGE
+        self.root_id = self.newNode(is_leaf=True).page_id
+        self.checkpoint()
+
+
+    def _setDegree(self, min_degree):
+        self.min_degree = min_degree
+        self.MAX_KEYS = (2 * min_degree) - 1
+        self.MIN_KEYS = min_degree - 1
+
+
+    @staticmethod
+    def maxDegree(page_size):
+        """ Largest min_degree whose full nodes (2t - 1 keys and values, 2t children) fit in one page. """
+        return (page_size - PAGE_HEADER.size + 16) // 48
+
+
+    @property
+    def root(self):
+        return self.getPage(self.root_id)
+
+    @root.setter
+    def root(self, node):
+        self.root_id = node.page_id
+
+
+    # ----------------------------------------------------------------------- #
+    #                   Storage hooks
+    # ----------------------------------------------------------------------- #
+    def newNode(self, is_leaf):
+        if self._loading:
+            # bulk_load only asks for a node once the previous ones are complete, and the meta page still
+            # points to the old tree until it ends: the new pages can be checkpointed and evicted at any time
+            self.trim()
+        if self.free_head != NO_PAGE:
+            page_id = self.free_head
+            self.free_head = self.getPage(page_id).next_page
+        else:
+            page_id = self.page_count
+            self.page_count += 1
+        node = PagedBTreeNode(is_leaf, page_id)
+        self._setDirty(node)
+        return node
+
+    def child(self, node, index):
+        return self.getPage(node.children[index])
+
+    def ref(self, node):
+        return node.page_id
+
+    def markDirty(self, node):
+        if not node.dirty:
+            self._setDirty(node)
+
+    def _setDirty(self, page):
+        page.dirty = True
+        self.cache.pop(page.page_id, None)
+        self.dirty_pages[page.page_id] = page
+
+    def freeNode(self, node):
+        self.freePage(node.page_id)
+
+    def freePage(self, page_id):
+        """ Put page_id at the head of the free list. """
+        self._setDirty(FreePage(page_id, self.free_head))
+        self.free_head = page_id
+
+
+    # ----------------------------------------------------------------------- #
+    #                   Buffer pool
+    # ----------------------------------------------------------------------- #
+    def getPage(self, page_id):
+        """ The decoded page page_id, from the buffer pool or read from the file. """
+        page = self.dirty_pages.get(page_id)
+        if page is not None:
+            return page
+        page = self.cache.get(page_id)
+        if page is None:
+            page = self.readPage(page_id)
+            self.cache[page_id] = page
+        else:
+            self.cache.move_to_end(page_id)
+        return page
+
+
+    def readPage(self, page_id):
+        offset = page_id * self.page_size
+        kind, n = PAGE_HEADER.unpack_from(self._map, offset)
+        offset += PAGE_HEADER.size
+        if kind == FREE_PAGE:
+            return FreePage(page_id, struct.unpack_from("<q", self._map, offset)[0])
+
+        node = PagedBTreeNode(kind == LEAF_PAGE, page_id)
+        fields = struct.unpack_from(f"<{2 * n if node.is_leaf else 3 * n + 1}q", self._map, offset)
+        node.keys = list(fields[:n])
+        node.values = list(fields[n: 2 * n])
+        node.children = list(fields[2 * n:])
+        return node
+
+
+    def encodePage(self, page):
+        """ The page_size bytes image of page. """
+        data = bytearray(self.page_size)
+        if isinstance(page, FreePage):
+            PAGE_HEADER.pack_into(data, 0, FREE_PAGE, 0)
+            struct.pack_into("<q", data, PAGE_HEADER.size, page.next_page)
+        else:
+            n = len(page.keys)
+            PAGE_HEADER.pack_into(data, 0, LEAF_PAGE if page.is_leaf else INTERNAL_PAGE, n)
+            struct.pack_into(f"<{2 * n + len(page.children)}q", data, PAGE_HEADER.size,
+                             *page.keys, *page.values, *page.children)
+        return data
+
+
+    def writePage(self, page_id, data):
+        """ Write a page image into its slot of the file (growing the file if needed). """
+        offset = page_id * self.page_size
+        if offset + self.page_size > len(self._map):
+            self._grow(offset + self.page_size)
+        self._map[offset: offset + self.page_size] = data
+
+
+    def _grow(self, size):
+        """ Extend the file (at least doubling it, so that growing is amortized) and map it again. """
+        size = max(size, 2 * len(self._map))
+        self._map.close()
+        self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), 0)
+
+
+    def trim(self):
+        """ Evict the least recently used clean pages until the pool holds cache_pages pages. If the dirty pages
+            alone do not fit, checkpoint first.
+        """
+        cache = self.cache
+        while cache and len(cache) + len(self.dirty_pages) > self.cache_pages:
+            cache.popitem(last=False)
+        if len(self.dirty_pages) > self.cache_pages and not self._recovering:
+            self.checkpoint()
+            self.trim()
+
+
+    # ----------------------------------------------------------------------- #
+    #                   Write-ahead log and checkpoints
+    # ----------------------------------------------------------------------- #
+    def _logRecord(self, buffer, record_type, payload):
+        header = LOG_HEADER.pack(record_type, len(payload))
+        buffer += header
+        buffer += payload
+        buffer += LOG_CRC.pack(zlib.crc32(payload, zlib.crc32(header)))
+
+
+    def _logOperation(self, record_type, payload):
+        if self._recovering:
+            return
+        self._logRecord(self._log_buffer, record_type, payload)
+        self._pending += 1
+        if self._pending >= self.group_commit:
+            self.commit()
+
+
+    def _appendLog(self, data):
+        """ Append data to the log and fsync it. """
+        self._log.write(data)
+        self._log.flush()
+        os.fsync(self._log.fileno())
+
+
+    def _logSize(self):
+        return os.fstat(self._log.fileno()).st_size
+
+
+    def commit(self):
+        """ Make the logged operations durable (one write and one fsync for the whole group). """
+        if self._log_buffer:
+            self._appendLog(self._log_buffer)
+            self._log_buffer = bytearray()
+            self._pending = 0
+
+
+    def checkpoint(self):
+        """
+            Write the pages modified since the last checkpoint and the meta page to the page file, then empty the log.
+            return:
+              - The number of pages written (the meta page excluded).
+        """
+        dirty_pages = self.dirty_pages
+        if not dirty_pages and not self._log_buffer and self._logSize() == 0:
+            return 0
+        images = [(page_id, self.encodePage(page)) for page_id, page in dirty_pages.items()]
+
+        # 1- Page images and commit record to the log (behind the operations of the group, if any)
+        batch = self._log_buffer
+        for page_id, data in images:
+            self._logRecord(batch, PAGE_RECORD, PAGE_PAYLOAD.pack(page_id) + data)
+        self._logRecord(batch, COMMIT_RECORD, COMMIT_PAYLOAD.pack(self.root_id, self.page_count, self.free_head))
+        self._appendLog(batch)
+        self._log_buffer = bytearray()
+        self._pending = 0
+
+        # 2- The same pages in place, then the manifest
+        self._applyPages(images, self.root_id, self.page_count, self.free_head)
+
+        # 3- The log is not needed any more
+        self._log.truncate(0)
+        os.fsync(self._log.fileno())
+
+        for page_id, page in dirty_pages.items():
+            page.dirty = False
+            self.cache[page_id] = page
+        self.dirty_pages = {}
+        return len(images)
+
+
+    def _applyPages(self, images, root_id, page_count, free_head):
+        for page_id, data in images:
+            self.writePage(page_id, data)
+        self.root_id, self.page_count, self.free_head = root_id, page_count, free_head
+        META.pack_into(self._map, 0, MAGIC, self.page_size, self.min_degree, root_id, page_count, free_head)
+        self._map.flush()
+        os.fsync(self._file.fileno())
+
+
+    def _readLog(self):
+        """ The complete records of the log, as (type, payload); reading stops at the first torn record. """
+        self._log.seek(0)
+        data = self._log.read()
+        records = []
+        offset = 0
+        while offset + LOG_HEADER.size <= len(data):
+            record_type, length = LOG_HEADER.unpack_from(data, offset)
+            end = offset + LOG_HEADER.size + length
+            if end + LOG_CRC.size > len(data):
+                break
+            payload = data[offset + LOG_HEADER.size: end]
+            if LOG_CRC.unpack_from(data, end)[0] != zlib.crc32(payload, zlib.crc32(data[offset: offset + LOG_HEADER.size])):
+                break
+            records.append((record_type, payload))
+            offset = end + LOG_CRC.size
+        return records
+
+
+    def _recover(self):
+        if self._logSize() == 0:
+            return
+        records = self._readLog()
+
+        # Redo the last checkpoint whose commit record is in the log; the operations before it are in its pages
+        start = 0
+        images = []
+        for position, (record_type, payload) in enumerate(records):
+            if record_type == PAGE_RECORD:
+                images.append((PAGE_PAYLOAD.unpack_from(payload)[0], payload[PAGE_PAYLOAD.size:]))
+            elif record_type == COMMIT_RECORD:
+                self._applyPages(images, *COMMIT_PAYLOAD.unpack(payload))
+                images = []
+                start = position + 1
+
+        self._recovering = True
+        try:
+            for record_type, payload in records[start:]:
+                if record_type == INSERT_RECORD:
+                    self.insert(INSERT_PAYLOAD.unpack(payload))
+                elif record_type == DELETE_RECORD:
+                    self.delete(DELETE_PAYLOAD.unpack(payload)[0])
+        finally:
+            self._recovering = False
+        self.checkpoint()
+        self.trim()
+
+
+    def close(self):
+        """ Checkpoint and close the files. """
+        if self._map.closed:
+            return
+        self.checkpoint()
+        self._map.close()
+        self._file.close()
+        self._log.close()
+        self.cache.clear()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+    # ----------------------------------------------------------------------- #
+    #                   Public operations (trim the pool when they are done)
+    # ----------------------------------------------------------------------- #
+    @staticmethod
+    def _pack(payload, *fields):
+        """ Encode a log payload. This also checks that keys and values fit in a page (64-bit integers), so it
+            is done before the tree changes: a rejected key never reaches a dirty page.
+        """
+        try:
+            return payload.pack(*fields)
+        except struct.error as error:
+            raise ValueError(f"paged BTree keys and values must be 64-bit integers, got {fields}") from error
+
+
+    def insert(self, key):
+        payload = self._pack(INSERT_PAYLOAD, *key)
+        super().insert(key)
+        self._logOperation(INSERT_RECORD, payload)
+        self.trim()
+
+
+    def delete(self, key):
+        payload = self._pack(DELETE_PAYLOAD, key)
+        deleted = super().delete(key)
+        if deleted:
+            self._logOperation(DELETE_RECORD, payload)
+        self.trim()
+        return deleted
+
+
+    def search(self, search_key, node=None):
+        result = super().search(search_key, node)
+        if node is None:
+            self.trim()
+        return result
+
+
+    def search_many(self, keys):
+        results = super().search_many(keys)
+        self.trim()
+        return results
+
+
+    def items(self, from_key=None):
+        """ Same as BTree.items. The nodes on the iteration stack are only read, so the pool can be trimmed
+            while iterating.
+        """
+        for item in super().items(from_key):
+            yield item
+            self.trim()
+
+
+    def _checkedItems(self, items):
+        """ The items, each checked to be a pair of 64-bit integers before it reaches a page. """
+        for key, value in items:
+            self._pack(INSERT_PAYLOAD, key, value)
+            yield key, value
+
+
+    def bulk_load(self, sorted_items, fill_factor=0.7):
+        """ Same as BTree.bulk_load. The pages of the previous content of the tree are released afterwards
+            (walked without going through the buffer pool). The load is not logged, it ends with a checkpoint.
+            The pool stays within cache_pages while loading: once the dirty pages fill it, the finished pages
+            are checkpointed (written to the file) and evicted, so the loaded data does not need to fit in memory.
+        """
+        old_root = self.root_id
+        self._loading = True
+        try:
+            super().bulk_load(self._checkedItems(sorted_items), fill_factor)
+        finally:
+            self._loading = False
+
+        stack = [old_root]
+        while stack:
+            page_id = stack.pop()
+            page = self.dirty_pages.get(page_id) or self.cache.get(page_id) or self.readPage(page_id)
+            stack.extend(page.children)
+            self.freePage(page_id)
+        self.checkpoint()
+        self.trim()
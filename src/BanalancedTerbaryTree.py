@@ -5,8 +5,17 @@
    In a ternary tree:
    - Each node has three possible children: a left child, a middle child, and a right child.
    - The nodes are connected by edges that represent the parent-child relationships.
+
+   Here it is used as a centered interval tree: every non-leaf node holds a center point (the median low of
+   its intervals) and splits them into the ones entirely on its left, the ones containing the center and the
+   ones entirely on its right. The intervals containing the center stay at the node, sorted by low and by high,
+   so a query reads only the ones it reports (plus one); the left and right groups become subtrees. Small
+   groups (at most max_entries intervals) are stored in leaf buckets, so no bucket grows past max_entries.
 """
 
+import time
+from bisect import bisect_right
+
 
 
 
@@ -20,80 +29,186 @@ class Interval:
 
 
 class Node:
-    def __init__(self, interval=None, intervals=None):
-        self.interval = interval  # Single interval for non-leaf nodes
-        self.intervals = intervals if intervals is not None else []      # List of intervals for leaf nodes
+    def __init__(self, center=None, start=None, end=None):
+        self.center = center      # Non-leaf nodes: the point that splits their intervals
+        self.start = start        # Tree.intervals[start..end] (inclusive): the bucket of a leaf node, or the
+        self.end = end            # intervals containing center of a non-leaf node, sorted by low
+        self.by_high = None       # Non-leaf nodes: the same intervals containing center, highest high first
         self.left = None
         self.right = None
-        self.overlapped = None
+
+    def isLeaf(self):
+        return self.center is None
 
     def __repr__(self):
-        if self.intervals:
-            return f"Leaf: {self.intervals}"
-        return f"Node: [{self.interval.low}, {self.interval.high}]"
+        if self.isLeaf():
+            return f"Leaf: intervals[{self.start}..{self.end}]"
+        return f"Node: center {self.center}, intervals[{self.start}..{self.end}]"
 
 
 class Tree:
     def __init__(self, max_entries):
         self.max_entries = max_entries
         self.root = None
+        self.intervals = []       # Backing array: every subtree owns a contiguous range of it
 
 
     def buildBalancedTree(self, intervals):
+        """
+            Build the tree over one sorted backing array. Each subtree owns a range [start, end] of it,
+            and splitNode partitions a range in place into its left | center | right sub-ranges,
+            so no per-level lists are allocated. Nodes only store their range (and non-leaf nodes the
+            by-high order of their center range).
+            Note: intervals is sorted and reordered in place and kept as the backing array.
+        """
         intervals.sort(key=lambda interval: interval.low)
+        self.intervals = intervals
+        self._scratch = [None] * len(intervals)   # Reused by every splitNode call
         self.root = self._buildTree(intervals, 0, len(intervals) - 1)
+        del self._scratch
 
 
     def _buildTree(self, intervals, start, end):
         if start > end:
             return
 
-        if len(intervals) <= self.max_entries:
-            node = Node()
-            node.intervals = intervals
-            return node
-
-        mid = (start + end) // 2
-        node = Node(intervals[mid])
+        if end - start + 1 <= self.max_entries:
+            return Node(start=start, end=end)
 
-        left_intervals, overlapped_intervals, right_intervals = self.splitNode(intervals, node)
-        #print(f"intervals = {left_intervals}, {overlapped_intervals}, {right_intervals}")
+        # The median low: the middle interval contains it, so both sides hold fewer than half of the range
+        center = intervals[(start + end) // 2].low
+        center_start, right_start = self.splitNode(intervals, start, end, center)
 
-        if len(left_intervals) > 0:
-            node.left = self._buildTree(left_intervals, 0, len(left_intervals) - 1)
-        if len(overlapped_intervals) > 0:
-            node.overlapped = self._buildTree(overlapped_intervals, 0, len(overlapped_intervals) - 1)
-        if len(right_intervals) > 0:
-            node.right = self._buildTree(right_intervals, 0, len(right_intervals) - 1)
+        node = Node(center, center_start, right_start - 1)
+        node.by_high = sorted(intervals[center_start:right_start], key=lambda interval: interval.high, reverse=True)
+        node.left = self._buildTree(intervals, start, center_start - 1)
+        node.right = self._buildTree(intervals, right_start, end)
 
         return node
 
 
-    def splitNode(self, intervals, node):
-        left, overlapped, right = [], [], []
-        for interval in intervals:
-            if interval.high < node.interval.low:
-                left.append(interval)
-            elif interval.low > node.interval.high:
-                right.append(interval)
+    def splitNode(self, intervals, start, end, center):
+        """
+            Partition intervals[start..end] (sorted by low) in place into:
+                left:   intervals[start .. center_start - 1]          high < center
+                center: intervals[center_start .. right_start - 1]    low <= center <= high
+                right:  intervals[right_start .. end]                 low > center
+            Each part stays sorted by low.
+            - The right part is already a contiguous suffix of the range (the lows are sorted), so it is
+              found with a binary search and not moved.
+            - The rest is a stable partition: left intervals are compacted to the front of the range and
+              the ones containing center are parked in the shared scratch buffer, then copied back behind them.
+            return:
+              - (center_start, right_start)
+        """
+        right_start = bisect_right(intervals, center, start, end + 1, key=lambda interval: interval.low)
+
+        scratch = self._scratch
+        write = start
+        parked = 0
+        for index in range(start, right_start):
+            interval = intervals[index]
+            if interval.high < center:
+                intervals[write] = interval
+                write += 1
             else:
-                overlapped.append(interval)   # Only add to overlapped
+                scratch[parked] = interval
+                parked += 1
 
-        return left, overlapped, right
+        for index in range(parked):
+            intervals[write + index] = scratch[index]
+            scratch[index] = None
+
+        return write, right_start
 
 
     def search(self, query):
-        pass
+        """ Overlapping Interval Search:
+            Return all the intervals in the tree that overlap query.
+
+            At a non-leaf node with center c, its own intervals all contain c:
+              - query entirely left of c: they overlap it exactly when low <= query.high, a prefix of the
+                by-low order. Entirely right of c: exactly when high >= query.low, a prefix of the by-high order.
+                Both scans stop at the first interval that does not overlap. A query containing c gets them all.
+              - every interval on the left ends before c, so the left subtree can only overlap the query if
+                query.low < c; every interval on the right starts after c, so the right subtree only if
+                query.high > c. Otherwise the subtree is skipped entirely.
+            Leaf buckets are sorted by low, so a bucket scan stops at the first interval with low > query.high.
+        """
+        result = []
+        intervals = self.intervals
+        stack = [self.root] if self.root is not None else []
+        while stack:
+            node = stack.pop()
+
+            if node.isLeaf():   # Leaf node: scan its range of the backing array
+                for index in range(node.start, node.end + 1):
+                    interval = intervals[index]
+                    if interval.low > query.high:
+                        break
+                    if interval.high >= query.low:
+                        result.append(interval)
+                continue
+
+            if query.high < node.center:
+                for index in range(node.start, node.end + 1):
+                    interval = intervals[index]
+                    if interval.low > query.high:
+                        break
+                    result.append(interval)
+            elif query.low > node.center:
+                for interval in node.by_high:
+                    if interval.high < query.low:
+                        break
+                    result.append(interval)
+            else:
+                result.extend(intervals[node.start:node.end + 1])
+
+            if node.right is not None and query.high > node.center:
+                stack.append(node.right)
+            if node.left is not None and query.low < node.center:
+                stack.append(node.left)
+
+        return result
+
+
+    def stab(self, point):
+        """ Stabbing query: return all the intervals that contain point. """
+        return self.search(Interval(point, point))
+
+
+    def tuneMaxEntries(self, intervals, queries, candidates=(4, 8, 16, 32, 64, 128, 256)):
+        """
+            Pick the leaf bucket size (max_entries) that answers the given queries fastest.
+            Params:
+              - intervals: The intervals to index.
+              - queries: A sample of query intervals, representative of the workload.
+              - candidates: The max_entries values to try.
+            return:
+              - Dict {max_entries: seconds to answer all queries}. The tree is left built with the fastest one.
+        """
+        timings = {}
+        for max_entries in candidates:
+            self.max_entries = max_entries
+            self.buildBalancedTree(intervals)
+            start_time = time.perf_counter()
+            for query in queries:
+                self.search(query)
+            timings[max_entries] = time.perf_counter() - start_time
+
+        self.max_entries = min(timings, key=timings.get)
+        self.buildBalancedTree(intervals)
+        return timings
 
 
     def printTree(self, node=None, level=0, prefix="Root: "):
         if node is None:
             node = self.root
 
-        if node.intervals:  # If the node is a leaf node with multiple intervals
-            print(' ' * (level * 4) + f"{prefix}Leaf: {node.intervals}")
-        else:  # If the node is a non-leaf node with a single interval
-            print(' ' * (level * 4) + f"{prefix}[{node.interval.low}, {node.interval.high}]")
+        if node.isLeaf():  # If the node is a leaf node with multiple intervals
+            print(' ' * (level * 4) + f"{prefix}Leaf: {self.intervals[node.start:node.end + 1]}")
+        else:  # A non-leaf node: its center and the intervals containing it
+            print(' ' * (level * 4) + f"{prefix}Center {node.center}: {self.intervals[node.start:node.end + 1]}")
 
         # Traverse the right subtree
         if node.right is not None:
@@ -101,9 +216,6 @@ class Tree:
         # Traverse the left subtree
         if node.left is not None:
             self.printTree(node.left, level + 1, "L--- ")
-        # Traverse the overlapped subtree
-        if node.overlapped is not None:
-            self.printTree(node.overlapped, level + 1, "O--- ")
 
 
 
@@ -12,8 +12,25 @@
         1- We first collect all nodes in a sorted array and then use the middle value to ensure that the tree is balanced.
         2- Using the middle value allows us to split the array evenly and create a balanced structure.
 
+    3- Self-balancing Tree (AVL):
+        1- The tree is kept balanced on every insert and delete, not rebuilt offline: every node stores its height,
+           and the heights of the two subtrees of any node differ by at most one (height is O(log n)).
+        2- After a change, the nodes on the path back to the root are rebalanced with rotations, so sorted input
+           (the worst case of the unbalanced tree) still gives O(log n) operations.
+
+    4- Scapegoat Tree (BalancedBinaryTree(scapegoat=True)):
+        1- Every node stores the size of its subtree, and inserts are plain BST inserts with no rotations.
+        2- When a node lands deeper than log_{1/alpha}(n), only the subtree of its lowest unbalanced ancestor
+           (the scapegoat) is rebuilt with the sorted-array method of the balanced tree: amortized O(log n) inserts,
+           and a rebuild only costs as much as the part of the tree that went out of balance.
+
 """
 
+import math
+
+from TreeDataStructure.src.AVLRotations import AVLBalancing
+
+
 class TreeNode:
     def __init__(self, data):
         self.data = data
@@ -21,7 +38,141 @@ class TreeNode:
         self.right = None
 
 
-class UnbalancedBinaryTree:
+class BinarySearchTree:
+    """ Lookups shared by the BST classes, all iterative: one walk down from self.root, so O(height) each.
+        That is O(n) on a skewed unbalanced tree and O(log n) once it is balanced (or on an AVLBinaryTree).
+        Equal values go to the right, so every value of the left subtree of a node is <= its value and every value
+        of its right subtree is >= its value (rotations keep that order).
+    """
+    def search(self, data):
+        """ Return the node holding data, or None. """
+        node = self.root
+        while node is not None:
+            if data == node.data:
+                return node
+            node = node.left if data < node.data else node.right
+        return None
+
+
+    def contains(self, data):
+        return self.search(data) is not None
+
+
+    def floor(self, data):
+        """ Largest value <= data, or None. """
+        return self._below(data, inclusive=True)
+
+
+    def ceiling(self, data):
+        """ Smallest value >= data, or None. """
+        return self._above(data, inclusive=True)
+
+
+    def predecessor(self, data):
+        """ Largest value < data, or None (data itself does not need to be in the tree). """
+        return self._below(data, inclusive=False)
+
+
+    def successor(self, data):
+        """ Smallest value > data, or None (data itself does not need to be in the tree). """
+        return self._above(data, inclusive=False)
+
+
+    def nearest(self, data):
+        """ The value closest to data (the smaller one on a tie), or None if the tree is empty. """
+        below = self.floor(data)
+        above = self.ceiling(data)
+        if below is None:
+            return above
+        if above is None or data - below <= above - data:
+            return below
+        return above
+
+
+    def _below(self, data, inclusive):
+        result = None
+        node = self.root
+        while node is not None:
+            if node.data < data or (inclusive and node.data == data):
+                result = node.data          # a candidate; anything closer is in its right subtree
+                node = node.right
+            else:
+                node = node.left
+        return result
+
+
+    def _above(self, data, inclusive):
+        result = None
+        node = self.root
+        while node is not None:
+            if node.data > data or (inclusive and node.data == data):
+                result = node.data          # a candidate; anything closer is in its left subtree
+                node = node.left
+            else:
+                node = node.right
+        return result
+
+
+    def delete(self, data):
+        """ Remove one node holding data.
+            return:
+              - True if a node was removed, False if data was not in the tree.
+        """
+        return self._unlink(data) is not None
+
+
+    def _unlink(self, data):
+        """ Plain BST delete of one node holding data. A node with two children takes the value of its in-order
+            successor, and the successor is removed instead.
+            return:
+              - None if data is not in the tree, else the path (root first) down to the parent of the node that
+                was taken out (empty if it was the root).
+        """
+        path = []
+        node = self.root
+        while node is not None and node.data != data:
+            path.append(node)
+            node = node.left if data < node.data else node.right
+        if node is None:
+            return None
+
+        if node.left is not None and node.right is not None:
+            path.append(node)
+            successor = node.right
+            while successor.left is not None:
+                path.append(successor)
+                successor = successor.left
+            node.data = successor.data
+            node = successor
+
+        # node has at most one child, which takes its place
+        child = node.left if node.left is not None else node.right
+        if not path:
+            self.root = child
+        elif path[-1].left is node:
+            path[-1].left = child
+        else:
+            path[-1].right = child
+        return path
+
+
+    def inOrderTraversal(self):
+        """ The values in sorted order (iterative). """
+        result = []
+        stack = []
+        node = self.root
+        while stack or node is not None:
+            while node is not None:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            result.append(node.data)
+            node = node.right
+        return result
+
+
+
+class UnbalancedBinaryTree(BinarySearchTree):
     def __init__(self):
         self.root = None
 
@@ -33,16 +184,18 @@ class UnbalancedBinaryTree:
         return self.root
 
     def _insert(self, data, current_node):
-        if data < current_node.data:
-            if current_node.left is None:
-                current_node.left = TreeNode(data)
-            else:
-                self._insert(data, current_node.left)
-        else:
-            if current_node.right is None:
-                current_node.right = TreeNode(data)
+        # Walk down with a loop: a skewed tree (sorted input) is as deep as it is large
+        while True:
+            if data < current_node.data:
+                if current_node.left is None:
+                    current_node.left = TreeNode(data)
+                    return
+                current_node = current_node.left
             else:
-                self._insert(data, current_node.right)
+                if current_node.right is None:
+                    current_node.right = TreeNode(data)
+                    return
+                current_node = current_node.right
 
     def printTree(self, node, level=0):
         if node is not None:
@@ -52,16 +205,92 @@ class UnbalancedBinaryTree:
 
 
 
-class BalancedBinaryTree:
+class ScapegoatTreeNode(TreeNode):
+    def __init__(self, data):
+        super().__init__(data)
+        self.size = 1            # number of nodes in the subtree rooted at this node
+
+
+class BalancedBinaryTree(BinarySearchTree):
     """ Construct a balanced BST in O(n) time with minimum possible height. These are efficient solution:
 
         1- Traverse given BST in inorder and store result in an array. This step takes O(n) time.
            Note that this array would be sorted as InOrder traversal (left-root-right) of BST always produces sorted sequence.
         2- Build a balanced BST from the above created sorted array using the recursive approach.
            This step also takes O(n) time as we traverse every element exactly once and processing an element takes O(1) time.
+
+        dswRebalance does the same in place (Day-Stout-Warren), without the array of nodes and without recursion.
+
+        With scapegoat=True the tree also balances itself on insert (see insert), rebuilding subtrees instead of
+        the whole tree. Its nodes then keep their subtree size, which the rebalancing methods keep up to date.
     """
-    def __init__(self):
+    def __init__(self, scapegoat=False, alpha=0.7):
+        """
+            Params:
+              - scapegoat: If True, insert keeps the height within log_{1/alpha}(n) + 1 nodes by partial rebuilds.
+              - alpha: Balance factor (0.5 < alpha < 1): a node is unbalanced when one of its subtrees holds more
+                       than alpha of its nodes. Lower alpha keeps the tree shorter at the cost of more rebuilds.
+        """
+        if not 0.5 < alpha < 1:
+            raise ValueError("alpha must be between 0.5 and 1")
         self.root = None
+        self.scapegoat = scapegoat
+        self.alpha = alpha
+
+    def insert(self, data):
+        """ Plain BST insert (iterative, equal values go to the right). In scapegoat mode, if the new node is
+            deeper than log_{1/alpha}(n), the lowest ancestor with more than alpha of its nodes in one subtree
+            is rebuilt with buildBalancedTree; such an ancestor always exists at that depth.
+        """
+        new_node = ScapegoatTreeNode(data) if self.scapegoat else TreeNode(data)
+        if self.root is None:
+            self.root = new_node
+            return self.root
+
+        path = []
+        node = self.root
+        while node is not None:
+            path.append(node)
+            node = node.left if data < node.data else node.right
+        if data < path[-1].data:
+            path[-1].left = new_node
+        else:
+            path[-1].right = new_node
+
+        if self.scapegoat:
+            for node in path:
+                node.size += 1
+            if len(path) > math.log(self.root.size) / math.log(1 / self.alpha):
+                child = new_node
+                for depth in range(len(path) - 1, -1, -1):
+                    if child.size > self.alpha * path[depth].size:
+                        self._rebuildSubtree(path, depth)
+                        break
+                    child = path[depth]
+        return self.root
+
+    def delete(self, data):
+        """ Remove one node holding data (see BinarySearchTree._unlink), keeping subtree sizes in scapegoat mode. """
+        path = self._unlink(data)
+        if path is None:
+            return False
+        if self.scapegoat:
+            for node in path:        # every node on the path lost one node below it
+                node.size -= 1
+        return True
+
+    def _rebuildSubtree(self, path, depth):
+        """ Rebuild the subtree of path[depth] (path runs from the root down) and link it back in place. """
+        node = path[depth]
+        nodes = []
+        self.storeBSTNodes(node, nodes)
+        subtree = self.buildBalancedTree(nodes, start=0, end=len(nodes)-1)
+        if depth == 0:
+            self.root = subtree
+        elif path[depth - 1].left is node:
+            path[depth - 1].left = subtree
+        else:
+            path[depth - 1].right = subtree
 
     def storeBSTNodes(self, node, nodes):
         """ Traverse the BST in inorder and store the nodes in a list.
@@ -87,17 +316,89 @@ class BalancedBinaryTree:
         # Recursively build the left and right subtrees
         node.left = self.buildBalancedTree(nodes, start, mid - 1)
         node.right = self.buildBalancedTree(nodes, mid + 1, end)
+        if isinstance(node, ScapegoatTreeNode):
+            node.size = end - start + 1
 
         return node
 
     def _buildBalancedTree(self, root):
-        """ Convert the unbalanced BST to a balanced one. """
+        """ Convert the unbalanced BST to a balanced one.
+            This recursive, list-based version picks the middle of every range as the root, which gives a different
+            (but equally short) shape than dswRebalance. It stays for that shape; for large or deeply skewed trees
+            use dswRebalance, which needs no list of nodes and no recursion.
+        """
         nodes = []
         self.storeBSTNodes(root, nodes)   # Store the nodes in a sorted order (inorder traversal)
         # Rebuild the balanced tree using the sorted list of nodes
         return self.buildBalancedTree(nodes, start=0, end=len(nodes)-1)
 
 
+    def dswRebalance(self, root=None):
+        """ Day-Stout-Warren: rebalance the BST rooted at root (self.root if None) in place, in O(n) time with
+            O(1) extra memory (a few pointers: no list of nodes, no recursion).
+            1- Tree to vine: right rotations turn the tree into a sorted chain of right children (the vine).
+            2- Vine to tree: rounds of left rotations on every other node of the vine. The first round only
+               lifts the extra nodes of the bottom level, so that every next round halves a perfect vine.
+            The result has minimum height, with the bottom level filled from the left.
+            Subtree sizes (scapegoat nodes) are fixed by every rotation: only the two rotated nodes change.
+            return:
+              - The new root of the rebalanced subtree. It replaces self.root only when the whole tree was
+                rebalanced (root is None or self.root); for any other subtree the caller links it back in.
+        """
+        whole_tree = root is None or root is self.root
+        pseudo_root = TreeNode(None)     # the vine hangs off its right pointer
+        pseudo_root.right = self.root if root is None else root
+        sized = isinstance(pseudo_root.right, ScapegoatTreeNode)
+
+        # 1- Tree to vine
+        size = 0
+        tail = pseudo_root
+        rest = tail.right
+        while rest is not None:
+            if rest.left is None:
+                tail = rest
+                rest = rest.right
+                size += 1
+            else:
+                pivot = rest.left        # rotate right around rest
+                rest.left = pivot.right
+                pivot.right = rest
+                if sized:
+                    pivot.size = rest.size
+                    rest.size = 1 + self._size(rest.left) + self._size(rest.right)
+                rest = pivot
+                tail.right = pivot
+
+        # 2- Vine to tree
+        perfect = (1 << (size + 1).bit_length() - 1) - 1     # nodes of the largest perfect tree that fits
+        self._compress(pseudo_root, size - perfect, sized)
+        size = perfect
+        while size > 1:
+            size //= 2
+            self._compress(pseudo_root, size, sized)
+
+        if whole_tree:
+            self.root = pseudo_root.right
+        return pseudo_root.right
+
+    def _compress(self, pseudo_root, count, sized=False):
+        """ Left-rotate every other node of the vine, count times from the top (fixing sizes if sized). """
+        scanner = pseudo_root
+        for _ in range(count):
+            child = scanner.right
+            scanner.right = child.right
+            scanner = scanner.right
+            child.right = scanner.left
+            scanner.left = child
+            if sized:
+                scanner.size = child.size
+                child.size = 1 + self._size(child.left) + self._size(child.right)
+
+    @staticmethod
+    def _size(node):
+        return node.size if node is not None else 0
+
+
     def preOrderTraversal(self, node, result):
         """ Preorder traversal to print the tree structure (root-left-right). """
         if node is None:
@@ -114,3 +415,80 @@ class BalancedBinaryTree:
             self.printTree(node.left, level+1)
 
 
+
+class AVLTreeNode(TreeNode):
+    def __init__(self, data):
+        super().__init__(data)
+        self.height = 1          # number of nodes on the longest path down to a leaf
+
+
+class AVLBinaryTree(BinarySearchTree, AVLBalancing):
+    """ Self-balancing BST (AVL): insert, search and delete are O(log n) whatever the order of the data.
+        All three are iterative. Insert and delete keep the path from the root in a list (a stack) and walk it
+        back bottom-up to fix heights and rotate, stopping as soon as a subtree comes out with the same height.
+        Equal values go to the right, like in UnbalancedBinaryTree.
+        The rotations and the per-node rebalance come from AVLBalancing (shared with BalancedIntervalTree).
+    """
+    def __init__(self):
+        self.root = None
+
+
+    def _rebalancePath(self, path):
+        """ Rebalance the nodes of path (root first) from the bottom up, linking every rebuilt subtree back into
+            its parent. Stops early once a subtree keeps its root and its height: nothing above it changed.
+        """
+        for depth in range(len(path) - 1, -1, -1):
+            node = path[depth]
+            old_height = node.height
+            subtree = self._rebalance(node)
+            if depth == 0:
+                self.root = subtree
+            else:
+                parent = path[depth - 1]
+                if parent.left is node:
+                    parent.left = subtree
+                else:
+                    parent.right = subtree
+            if subtree is node and node.height == old_height:
+                return
+
+
+    def insert(self, data):
+        new_node = AVLTreeNode(data)
+        if self.root is None:
+            self.root = new_node
+            return self.root
+
+        path = []
+        node = self.root
+        while node is not None:
+            path.append(node)
+            node = node.left if data < node.data else node.right
+
+        parent = path[-1]
+        if data < parent.data:
+            parent.left = new_node
+        else:
+            parent.right = new_node
+        self._rebalancePath(path)
+        return self.root
+
+
+    def delete(self, data):
+        """ Remove one node holding data (see BinarySearchTree._unlink), then rebalance the path above it.
+            return:
+              - True if a node was removed, False if data was not in the tree.
+        """
+        path = self._unlink(data)
+        if path is None:
+            return False
+        if path:
+            self._rebalancePath(path)
+        return True
+
+
+    def printTree(self, node, level=0):
+        if node is not None:
+            self.printTree(node.right, level+1)
+            print(' ' * 4 * level + '->', node.data)
+            self.printTree(node.left, level+1)
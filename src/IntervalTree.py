@@ -31,6 +31,10 @@ class Node:
     def __init__(self, interval):
         self.interval = interval
         self.max = interval.high    # The maximum high value in this subtree
+        self.height = 1             # Height of the subtree rooted at this node (used by AVL balancing)
+        self.size = 1               # Number of nodes in the subtree rooted at this node
+        self.deleted = False        # Tombstone: the interval was deleted but the node is still in the tree
+        self.dead = 0               # Number of tombstones in the subtree rooted at this node
         self.left = None
         self.right = None
 
@@ -39,6 +43,37 @@ class Node:
 
 
 
+def iterOverlapping(root, query):
+    """ Report-all Overlapping Interval Search:
+        Generator yielding every interval in the subtree of root that overlaps query, in order of low.
+
+        It is an in-order traversal driven by an explicit stack (no recursion frames) with two prunings:
+          - a subtree whose max < query.low ends before the query starts, so it is skipped entirely.
+          - in-order visits lows in ascending order, so once a node has low > query.high no later node
+            can overlap and the traversal stops.
+        This gives O(log n + k) work for k reported intervals on a balanced tree, and the first result is
+        available before the rest of the tree has been visited.
+    """
+    stack = []
+    node = root
+    while stack or node is not None:
+        # Walk down the left spine, skipping subtrees that end before the query starts
+        while node is not None and node.max >= query.low:
+            stack.append(node)
+            node = node.left
+
+        if not stack:
+            return
+        node = stack.pop()
+
+        if node.interval.low > query.high:
+            return
+        if node.interval.high >= query.low and not node.deleted:
+            yield node.interval
+
+        node = node.right
+
+
 class UnbalancedIntervalTree:
     def __init__(self):
         self.root = None
@@ -60,10 +95,67 @@ class UnbalancedIntervalTree:
 
         # Update the max value for this node
         current_node.max = max(current_node.max, interval.high)
+        current_node.size += 1
 
         return current_node
 
 
+    def delete(self, interval):
+        """ Remove one interval equal to the given one from the tree.
+            return:
+              - True if an interval was removed, False if it was not in the tree.
+        """
+        self.root, deleted = self._delete(self.root, interval)
+        return deleted
+
+    def _delete(self, current_node, interval):
+        """ Returns (new root of the subtree, whether the interval was found). The max (and size) of every
+            node on the path is repaired on the way back up.
+        """
+        if current_node is None:
+            return None, False
+
+        if interval.low < current_node.interval.low:
+            current_node.left, deleted = self._delete(current_node.left, interval)
+        elif interval.low > current_node.interval.low or current_node.interval != interval:
+            # Intervals with the same low were inserted to the right
+            current_node.right, deleted = self._delete(current_node.right, interval)
+        else:
+            deleted = True
+            if current_node.left is None:
+                return current_node.right, True
+            if current_node.right is None:
+                return current_node.left, True
+
+            # Two children: replace the interval with its in-order successor (leftmost node on the right)
+            successor = current_node.right
+            while successor.left is not None:
+                successor = successor.left
+            current_node.interval = successor.interval
+            current_node.right, _ = self._delete(current_node.right, successor.interval)
+
+        if deleted:
+            current_node.max = current_node.interval.high
+            current_node.size = 1
+            for child in (current_node.left, current_node.right):
+                if child is not None:
+                    current_node.max = max(current_node.max, child.max)
+                    current_node.size += child.size
+
+        return current_node, deleted
+
+
+    def update(self, old_interval, new_interval):
+        """ Replace old_interval with new_interval (e.g. a corrected record).
+            return:
+              - True if old_interval was found and replaced, False otherwise (nothing is inserted then).
+        """
+        if not self.delete(old_interval):
+            return False
+        self.insert(new_interval)
+        return True
+
+
     def inOrder(self, node):
         """ Inorder Traversal (left, root, right). """
         if node is None:
@@ -95,6 +187,11 @@ class UnbalancedIntervalTree:
             return self.isOverlapping(root.right, search_interval)
 
 
+    def find_all_overlapping(self, query):
+        """ Generator over all intervals in the tree that overlap query (see iterOverlapping). """
+        return iterOverlapping(self.root, query)
+
+
     def printTree(self, node, level=0):
         """ Print the tree in a structured way, showing levels. """
         if node is None:
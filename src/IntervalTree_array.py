@@ -0,0 +1,238 @@
+"""
+    Array-backed Interval Tree:
+    A frozen (read-only) version of BalancedIntervalTree that keeps the intervals in contiguous NumPy arrays
+    instead of Node/Interval objects, so that thousands of queries can be answered at once with vectorized code.
+
+    Layout (implicit / Eytzinger layout):
+        The intervals are sorted by low and stored in a complete binary tree laid out level by level
+        (breadth-first), exactly like a binary heap:
+            - the root is at slot 0
+            - the children of slot i are at slots 2i + 1 and 2i + 2 (if they are < n)
+        No child pointers are stored. An in-order traversal of the slots visits the intervals sorted by low,
+        so it is a balanced BST on low, and the top levels of the tree share a few cache lines.
+
+    Arrays (all of length n, indexed by slot):
+        1- low:  low endpoint of the interval stored at the slot.
+        2- high: high endpoint of the interval stored at the slot.
+        3- max:  the maximum high value in the subtree rooted at the slot (the usual interval tree augmentation).
+        4- ids:  the row id of the interval (its position in the input).
+"""
+
+import numpy as np
+
+
+class ArrayIntervalTree:
+    def __init__(self, lows, highs, ids=None):
+        """
+            Params:
+              - lows, highs: Array-likes with the endpoints of the intervals (any order).
+              - ids: Optional array-like of row ids reported by queries. Defaults to the input positions.
+        """
+        lows = np.asarray(lows)
+        highs = np.asarray(highs)
+        if lows.shape != highs.shape or lows.ndim != 1:
+            raise ValueError("lows and highs must be one-dimensional arrays of the same length")
+        if ids is not None:
+            ids = np.asarray(ids)
+            if ids.shape != lows.shape:
+                raise ValueError("ids must have the same length as lows and highs")
+
+        order = np.argsort(lows, kind="stable")
+        slots = order[self._inorderRanks(len(lows))]    # input row stored at every slot
+        del order
+
+        self.low = lows[slots]
+        self.high = highs[slots]
+        self.ids = slots if ids is None else ids[slots]   # the input positions are the default ids
+        self.max = self._subtreeMax(self.high)
+        self._sorted_lows = None    # Sorted endpoint arrays for count queries, built on first use
+        self._sorted_highs = None
+
+
+    @classmethod
+    def from_arrays(cls, lows, highs, ids=None):
+        """ Bulk-load the tree straight from columns (NumPy arrays, pandas Series, lists...).
+
+            Nothing is created per row: the columns are argsorted once, placed into the implicit layout with
+            a gather, and the max augmentation is filled in bottom-up one level at a time. Extra memory is a
+            few integer arrays of length n. Datetime columns (datetime64) work as-is, as long as the queries
+            use the same type.
+        """
+        return cls(lows, highs, ids)
+
+
+    @classmethod
+    def fromLayout(cls, low, high, max, ids, sorted_lows=None, sorted_highs=None):
+        """ Wrap arrays that are already in the implicit layout (e.g. views of another tree's arrays placed in
+            shared memory) without copying or re-sorting them. sorted_lows / sorted_highs, if given, are the
+            sorted endpoint arrays of count_many (see sortedEndpoints), so they are not sorted again either.
+        """
+        tree = cls.__new__(cls)
+        tree.low = low
+        tree.high = high
+        tree.max = max
+        tree.ids = ids
+        tree._sorted_lows = sorted_lows
+        tree._sorted_highs = sorted_highs
+        return tree
+
+
+    @classmethod
+    def fromIntervals(cls, intervals):
+        """ Build from a list of Interval objects; ids are the positions in that list. """
+        lows = np.array([interval.low for interval in intervals])
+        highs = np.array([interval.high for interval in intervals])
+        return cls(lows, highs)
+
+
+    def __len__(self):
+        return len(self.low)
+
+
+    @staticmethod
+    def _levels(n):
+        """ Slot ranges [start, end) of every level of the implicit tree, from the root down. """
+        levels = []
+        start = 0
+        width = 1
+        while start < n:
+            levels.append((start, min(start + width, n)))
+            start += width
+            width *= 2
+        return levels
+
+
+    def _inorderRanks(self, n):
+        """ For every slot, the position (in sorted order) of the interval stored there.
+            Computed level by level: first the subtree sizes bottom-up, then the ranks top-down
+            (rank = first rank of the subtree + size of the left subtree).
+        """
+        levels = self._levels(n)
+        size = np.zeros(2 * n + 2, dtype=np.intp)    # padded so that children of the last level can be read
+        size[:n] = 1
+        for start, end in reversed(levels):
+            slots = np.arange(start, end)
+            size[slots] += size[2 * slots + 1] + size[2 * slots + 2]
+
+        first = np.zeros(2 * n + 2, dtype=np.intp)   # smallest rank in the subtree of each slot
+        rank = np.empty(n, dtype=np.intp)
+        for start, end in levels:
+            slots = np.arange(start, end)
+            rank[slots] = first[slots] + size[2 * slots + 1]
+            first[2 * slots + 1] = first[slots]
+            first[2 * slots + 2] = rank[slots] + 1
+        return rank
+
+
+    def _subtreeMax(self, high):
+        """ max[i] = max(high[i], max[left child], max[right child]), computed bottom-up one level at a time. """
+        n = len(high)
+        if n == 0:
+            return high.copy()
+        subtree_max = np.full(2 * n + 2, high.min(), dtype=high.dtype)   # padding never wins the max
+        subtree_max[:n] = high
+        for start, end in reversed(self._levels(n)):
+            slots = np.arange(start, end)
+            subtree_max[slots] = np.maximum(subtree_max[slots],
+                                            np.maximum(subtree_max[2 * slots + 1], subtree_max[2 * slots + 2]))
+        return subtree_max[:n]
+
+
+    def query_many(self, lows, highs, chunk_size=256):
+        """ Batched Overlapping Interval Search:
+            Find, for every query window [lows[j], highs[j]], all the intervals that overlap it.
+
+            All queries of a chunk walk down the tree together, one level per iteration. The frontier is a pair
+            of arrays (query, slot) and every step is a vectorized operation over the whole frontier:
+              - a slot whose max < query low cannot hold a match in its subtree, so the pair is dropped.
+              - the left child is always visited (its max is checked in the next iteration).
+              - the right child is only visited if low[slot] <= query high, because every interval in the
+                right subtree has low >= low[slot].
+            The loop runs once per level of the tree (O(log n) iterations per chunk). Queries are processed
+            chunk_size at a time so that the frontier stays small enough to live in cache.
+
+            return:
+              - (offsets, ids) in CSR form: the ids matching query j are ids[offsets[j]:offsets[j + 1]]
+                (in no particular order within a query).
+        """
+        lows = np.asarray(lows)
+        highs = np.asarray(highs)
+        if lows.shape != highs.shape or lows.ndim != 1:
+            raise ValueError("lows and highs must be one-dimensional arrays of the same length")
+        if not 0 < chunk_size <= 65536:
+            raise ValueError("chunk_size must be between 1 and 65536")
+
+        m = len(lows)
+        counts = []
+        matches = []
+        for start in range(0, m, chunk_size):
+            chunk_counts, chunk_ids = self._queryChunk(lows[start:start + chunk_size], highs[start:start + chunk_size])
+            counts.append(chunk_counts)
+            matches.append(chunk_ids)
+
+        offsets = np.zeros(m + 1, dtype=np.intp)
+        if m > 0:
+            np.cumsum(np.concatenate(counts), out=offsets[1:])
+        ids = np.concatenate(matches) if matches else self.ids[:0]
+        return offsets, ids
+
+
+    def _queryChunk(self, lows, highs):
+        """ Run one chunk of queries through the tree; returns (number of matches per query, matched ids
+            grouped by query).
+        """
+        n = len(self.low)
+        m = len(lows)
+        matched_queries = [np.zeros(0, dtype=np.uint16)]
+        matched_slots = [np.zeros(0, dtype=np.intp)]
+
+        # Query numbers are local to the chunk, so they fit in 16 bits and the final grouping is a radix sort
+        query = np.arange(m if n > 0 else 0, dtype=np.uint16)
+        slot = np.zeros(len(query), dtype=np.intp)
+        while len(query) > 0:
+            query_low = lows[query]
+            keep = self.max[slot] >= query_low
+            query, slot, query_low = query[keep], slot[keep], query_low[keep]
+
+            query_high = highs[query]
+            slot_low = self.low[slot]
+            overlap = (slot_low <= query_high) & (self.high[slot] >= query_low)
+            matched_queries.append(query[overlap])
+            matched_slots.append(slot[overlap])
+
+            left = 2 * slot + 1
+            right = left + 1
+            go_left = left < n
+            go_right = (right < n) & (slot_low <= query_high)
+            query = np.concatenate((query[go_left], query[go_right]))
+            slot = np.concatenate((left[go_left], right[go_right]))
+
+        matched_queries = np.concatenate(matched_queries)
+        order = np.argsort(matched_queries, kind="stable")
+        matched_ids = self.ids[np.concatenate(matched_slots)[order]]
+        return np.bincount(matched_queries, minlength=m), matched_ids
+
+
+    def count_many(self, lows, highs):
+        """ Batched Overlap Count Query:
+            For every query window [lows[j], highs[j]], the number of intervals that overlap it, using
+                count = #(low <= query high) - #(high < query low)
+            over sorted endpoint arrays (two vectorized binary searches, O(log n) per query).
+            return:
+              - Array of counts, one per query.
+        """
+        sorted_lows, sorted_highs = self.sortedEndpoints()
+        return np.searchsorted(sorted_lows, highs, side="right") - np.searchsorted(sorted_highs, lows, side="left")
+
+
+    def sortedEndpoints(self):
+        """ The sorted low and high arrays used by count_many, built on first use (O(n log n)). """
+        if self._sorted_highs is None:
+            self._sorted_lows = np.sort(self.low)
+            self._sorted_highs = np.sort(self.high)
+        return self._sorted_lows, self._sorted_highs
+
+
+    def count_overlapping(self, low, high):
+        """ Number of intervals that overlap the single window [low, high]. """
+        return int(self.count_many(np.asarray([low]), np.asarray([high]))[0])
@@ -1,26 +1,81 @@
 """
     How to balance an Interval Tree?
     After inserting intervals, the tree might be unbalanced (similar to a regular binary search tree).
-    There are two approaches:
+    There are three approaches:
 
-        (1) AVL Tree (dynamic balancing with rotations).
-        (2) Rebuild the Tree (static balancing by collecting and re-inserting).
+        (1) AVL Tree (dynamic balancing with rotations): BalancedIntervalTree(balance="avl").
+            A rotation only changes the subtrees of the two rotated nodes, so their max values are
+            recomputed from their children (by _update) right after the rotation; see AVLRotations.AVLBalancing.
+        (2) Rebuild the Tree (static balancing by collecting and re-inserting): rebuildTree().
+        (3) Scapegoat (partial rebuilds, no rotations): BalancedIntervalTree(balance="scapegoat").
+            Inserts are plain BST inserts that keep the size of every subtree. When a new node lands deeper than
+            log_{1/alpha}(n), only the subtree of its lowest unbalanced ancestor is rebuilt with buildBalancedTree.
 
 """
 
-from TreeDataStructure.src.IntervalTree import Node
+import math
 
+from TreeDataStructure.src.AVLRotations import AVLBalancing
+from TreeDataStructure.src.BTree_BalancedTree import BTree
+from TreeDataStructure.src.IntervalTree import Interval, Node, iterOverlapping
+from TreeDataStructure.src.QueryCache import QueryCache
 
 
-class BalancedIntervalTree:
-    def __init__(self):
+
+class BalancedIntervalTree(AVLBalancing):
+    BALANCE_MODES = (None, "avl", "scapegoat")
+
+    def __init__(self, balance=None, tombstones=False, tombstone_threshold=0.25, cache_size=None, alpha=0.7):
+        """
+            Params:
+              - balance: How the tree stays balanced.
+                    None  -> plain BST insert; call rebuildTree to balance the tree (static balancing).
+                    "avl" -> every insert rebalances the tree with rotations (dynamic balancing), so inserts
+                             and overlap searches stay O(log n) even when intervals arrive sorted by low.
+                    "scapegoat" -> inserts rebuild the smallest unbalanced subtree above a node that lands deeper
+                             than log_{1/alpha}(n): amortized O(log n) inserts and a height of at most
+                             log_{1/alpha}(n) + 1 nodes (under inserts), without rotations.
+              - tombstones: If True, delete only marks the node as deleted (a tombstone) instead of unlinking it.
+                            Searches skip tombstones, and once more than tombstone_threshold of the nodes of a
+                            subtree on the delete path are tombstones, that subtree alone is rebuilt without them.
+                            Not available with balance="avl", where a real delete is already O(log n).
+              - tombstone_threshold: Fraction of tombstones (0 < threshold < 1) that triggers a partial rebuild.
+              - cache_size: If set, isOverlapping and count_overlapping answers on the whole tree are kept in an
+                            LRU QueryCache of that many entries (see QueryCache.py). It is invalidated by the
+                            version counter, and tree.cache.stats() reports its hits and misses.
+              - alpha: Balance factor of the scapegoat mode (0.5 < alpha < 1): a node is unbalanced when one of
+                       its subtrees holds more than alpha of its nodes. Lower alpha keeps the tree shorter at the
+                       cost of more frequent rebuilds.
+        """
+        if balance not in self.BALANCE_MODES:
+            raise ValueError(f"Unknown balance mode {balance!r}, expected one of {self.BALANCE_MODES}")
+        if tombstones and balance == "avl":
+            raise ValueError("tombstones cannot be combined with balance='avl'")
+        if not 0 < tombstone_threshold < 1:
+            raise ValueError("tombstone_threshold must be between 0 and 1")
+        if not 0.5 < alpha < 1:
+            raise ValueError("alpha must be between 0.5 and 1")
         self.root = None
+        self.balance = balance
+        self.tombstones = tombstones
+        self.tombstone_threshold = tombstone_threshold
+        self.alpha = alpha
+        self.version = 0            # Bumped by every change (insert, delete, rebuildTree) to invalidate caches
+        self._highs = None          # (root, order-statistic BTree of the live highs) used by count_overlapping
+        self.cache = QueryCache(cache_size) if cache_size is not None else None
 
     def insert(self, interval):
-        if self.root is None:
+        self.version += 1
+        root = self.root
+        if self.balance == "avl":
+            self.root = self._insertAVL(self.root, interval)
+        elif self.balance == "scapegoat":
+            self._insertScapegoat(interval)
+        elif self.root is None:
             self.root = Node(interval)
         else:
             self._insert(self.root, interval)
+        self._trackHighs(root, interval, added=True)
         return self.root
 
 
@@ -35,21 +90,227 @@ class BalancedIntervalTree:
 
         # Update max of node
         node.max = max(node.max, interval.high)
+        node.size += 1
+
+        return node
+
+
+    def _insertAVL(self, node, interval):
+        """ Insert like _insert, then rebalance every node on the way back up to the root.
+            Returns the (possibly new) root of the subtree.
+        """
+        if node is None:
+            return Node(interval)
+
+        if interval.low < node.interval.low:
+            node.left = self._insertAVL(node.left, interval)
+        else:
+            node.right = self._insertAVL(node.right, interval)
+
+        return self._rebalance(node)
+
+
+    def _insertScapegoat(self, interval):
+        """ Plain BST insert (iterative), keeping size and max up to date on the way down. If the new node is
+            deeper than log_{1/alpha}(n), some ancestor on its path holds more than alpha of its nodes in one
+            subtree (the scapegoat): the lowest such subtree is rebuilt, and nothing else is touched.
+        """
+        new_node = Node(interval)
+        if self.root is None:
+            self.root = new_node
+            return
+
+        path = []
+        node = self.root
+        while node is not None:
+            path.append(node)
+            node.size += 1
+            node.max = max(node.max, interval.high)
+            node = node.left if interval.low < node.interval.low else node.right
+
+        if interval.low < path[-1].interval.low:
+            path[-1].left = new_node
+        else:
+            path[-1].right = new_node
+
+        if len(path) > math.log(self.root.size) / math.log(1 / self.alpha):
+            child = new_node
+            for depth in range(len(path) - 1, -1, -1):
+                if child.size > self.alpha * path[depth].size:
+                    self._rebuildSubtree(path, depth)
+                    return
+                child = path[depth]
+
+
+    def _update(self, node):
+        """ Recompute height, size, tombstone count and max of a node from its children.
+            Tombstones do not count towards max, so max only prunes on intervals that are still in the tree.
+        """
+        node.height = 1
+        node.size = 1
+        node.dead = 1 if node.deleted else 0
+        node.max = node.interval.high if not node.deleted else float("-inf")
+        for child in (node.left, node.right):
+            if child is not None:
+                node.height = max(node.height, child.height + 1)
+                node.size += child.size
+                node.dead += child.dead
+                node.max = max(node.max, child.max)
+
+
+    def delete(self, interval):
+        """ Remove one interval equal to the given one from the tree, repairing max along the path.
+            In tombstone mode the node is only marked as deleted (see __init__).
+            return:
+              - True if an interval was removed, False if it was not in the tree.
+        """
+        root = self.root
+        if self.tombstones:
+            path = []
+            if not self._markDeleted(self.root, interval, path):
+                return False
+            self.version += 1
+            self._compact(path)
+            self._trackHighs(root, interval, added=False)
+            return True
+
+        self.root, deleted = self._delete(self.root, interval)
+        if deleted:
+            self.version += 1
+            self._trackHighs(root, interval, added=False)
+        return deleted
+
+
+    def update(self, old_interval, new_interval):
+        """ Replace old_interval with new_interval (e.g. a corrected record).
+            return:
+              - True if old_interval was found and replaced, False otherwise (nothing is inserted then).
+        """
+        if not self.delete(old_interval):
+            return False
+        self.insert(new_interval)
+        return True
+
 
+    def _repair(self, node):
+        """ Fix a node after one of its subtrees changed: rebalance in AVL mode, otherwise recompute it. """
+        if self.balance == "avl":
+            return self._rebalance(node)
+        self._update(node)
         return node
 
 
+    def _delete(self, node, interval):
+        """ Returns (new root of the subtree, whether the interval was found). """
+        if node is None:
+            return None, False
+
+        if interval.low < node.interval.low:
+            node.left, deleted = self._delete(node.left, interval)
+        elif interval.low > node.interval.low:
+            node.right, deleted = self._delete(node.right, interval)
+        elif node.interval != interval:
+            # Same low: after rotations equal lows can be on both sides of the node
+            deleted = False
+            if node.left is not None and node.left.max >= interval.high:
+                node.left, deleted = self._delete(node.left, interval)
+            if not deleted:
+                node.right, deleted = self._delete(node.right, interval)
+        else:
+            if node.left is None:
+                return node.right, True
+            if node.right is None:
+                return node.left, True
+
+            # Two children: the in-order successor (leftmost node on the right) takes this node's place
+            node.right, successor = self._popMin(node.right)
+            successor.left = node.left
+            successor.right = node.right
+            return self._repair(successor), True
+
+        if not deleted:
+            return node, False
+        return self._repair(node), True
+
+
+    def _popMin(self, node):
+        """ Unlink the leftmost node of the subtree. Returns (new root of the subtree, leftmost node). """
+        if node.left is None:
+            return node.right, node
+        node.left, leftmost = self._popMin(node.left)
+        return self._repair(node), leftmost
+
+
+    def _markDeleted(self, node, interval, path):
+        """ Tombstone one live node holding interval. path collects the nodes from the root down to it. """
+        if node is None or node.max < interval.high:
+            return False
+
+        path.append(node)
+        found = False
+        if interval.low < node.interval.low:
+            found = self._markDeleted(node.left, interval, path)
+        elif interval.low > node.interval.low:
+            found = self._markDeleted(node.right, interval, path)
+        elif not node.deleted and node.interval == interval:
+            node.deleted = True
+            found = True
+        else:
+            found = self._markDeleted(node.left, interval, path) or self._markDeleted(node.right, interval, path)
+
+        if found:
+            self._update(node)
+        else:
+            path.pop()
+        return found
+
+
+    def _compact(self, path):
+        """ Partial rebuild: find the highest node on the delete path whose subtree has too many tombstones,
+            rebuild only that subtree from its live intervals and repair the nodes above it.
+            Each rebuild of a subtree of size s removes more than tombstone_threshold * s tombstones,
+            so the amortized cost per delete stays O(log n).
+        """
+        for depth, node in enumerate(path):
+            if node.dead > self.tombstone_threshold * node.size:
+                self._rebuildSubtree(path, depth)
+                return
+
+
+    def _rebuildSubtree(self, path, depth):
+        """ Rebuild the subtree of path[depth] (path runs from the root down) from its live intervals with
+            buildBalancedTree, link it back in place and repair the nodes above it.
+        """
+        node = path[depth]
+        intervals = []
+        self.inOrderTraversal(node, intervals)
+        subtree = self.buildBalancedTree(intervals, start=0, end=len(intervals) - 1)
+
+        if depth == 0:
+            self.root = subtree
+            return
+        parent = path[depth - 1]
+        if parent.left is node:
+            parent.left = subtree
+        else:
+            parent.right = subtree
+        for ancestor in reversed(path[:depth]):
+            self._update(ancestor)
+
+
     def inOrderTraversal(self, node, intervals):
         """ Collect Intervals (Inorder Traversal):
             Param:
             - intervals is simply a list (nodes = []) that is used to store all the nodes from
                   the binary search tree (BST) when performing an in-order traversal.
+            Tombstones are skipped.
         """
         if node is None:
             return None
 
         self.inOrderTraversal(node.left, intervals)
-        intervals.append(node.interval)
+        if not node.deleted:
+            intervals.append(node.interval)
         self.inOrderTraversal(node.right, intervals)
 
     def buildBalancedTree(self, intervals, start, end):
@@ -64,41 +325,192 @@ class BalancedIntervalTree:
         node.left = self.buildBalancedTree(intervals, start, mid - 1)
         node.right = self.buildBalancedTree(intervals, mid + 1, end)
 
-        # Correct the max value based on the left and right subtrees
-        node.max = node.interval.high
-        if node.left:
-            node.max = max(node.max, node.left.max)
-        if node.right:
-            node.max = max(node.max, node.right.max)
+        # Correct the max value (and height) based on the left and right subtrees
+        self._update(node)
 
         return node
 
     def rebuildTree(self, node):
         """ Rebuild the tree from collected intervals. """
+        self.version += 1
         intervals = []
         self.inOrderTraversal(node, intervals)
         return self.buildBalancedTree(intervals, start=0, end=len(intervals) - 1)
 
+    def _cached(self, kind, query, compute):
+        """ Answer a query on the whole tree from the cache, or compute and store it. """
+        key = (kind, query.low, query.high)
+        version = (self.version, self.root)     # root identity also catches direct root assignments
+        result = self.cache.get(key, version)
+        if result is QueryCache.MISSING:
+            result = compute()
+            self.cache.put(key, version, result)
+        return result
+
+
     def isOverlapping(self, root, search_interval):
         """ Overlapping Interval Search:
             This function checks if an interval overlaps with any interval in the tree.
         """
+        if self.cache is not None and root is self.root:
+            return self._cached("first", search_interval, lambda: self._isOverlapping(root, search_interval))
+        return self._isOverlapping(root, search_interval)
+
+
+    def _isOverlapping(self, root, search_interval):
         if root is None:
             return None
 
         # Check if the search interval overlaps with the current root's interval
-        if root.interval.low <= search_interval.high and search_interval.low <= root.interval.high:
+        if root.interval.low <= search_interval.high and search_interval.low <= root.interval.high and not root.deleted:
             #print(f"Found overlapping interval: {root.interval}")
             return root.interval
 
         # Check if the max value in the left subtree is greater than or equal to the search interval's low
         if root.left is not None and root.left.max >= search_interval.low:
             #print(f"Going left, max of left subtree: {root.left.max}")
-            return self.isOverlapping(root.left, search_interval)
+            return self._isOverlapping(root.left, search_interval)
 
         # Otherwise, search the right subtree
         #print(f"Going right")
-        return self.isOverlapping(root.right, search_interval)
+        return self._isOverlapping(root.right, search_interval)
+
+
+    def find_all_overlapping(self, query):
+        """ Report-all Overlapping Interval Search:
+            Generator over every interval in the tree that overlaps query, in order of low.
+            Use list(tree.find_all_overlapping(query)) when the full result list is needed.
+        """
+        return iterOverlapping(self.root, query)
+
+
+    def stab_many(self, points):
+        """ Batched Stabbing Query (sorted sweep):
+            Generator of (point, intervals containing point) for every point, in ascending order of point.
+
+            Instead of one tree search per point, the points are sorted and swept once over the start and end
+            events of the intervals: an interval becomes active when the sweep reaches its low and stops being
+            active once the sweep passes its high. The active set is kept in a dict, so each interval is added
+            and removed once. Total cost O((n + q) log n + k) for q points and k reported intervals.
+        """
+        intervals = []
+        self.inOrderTraversal(self.root, intervals)    # sorted by low: the start events
+        ends = sorted(range(len(intervals)), key=lambda index: intervals[index].high)
+
+        active = {}
+        next_start = 0
+        next_end = 0
+        for point in sorted(points):
+            while next_start < len(intervals) and intervals[next_start].low <= point:
+                active[next_start] = intervals[next_start]
+                next_start += 1
+            while next_end < len(ends) and intervals[ends[next_end]].high < point:
+                del active[ends[next_end]]
+                next_end += 1
+            yield point, list(active.values())
+
+
+    def count_overlapping(self, query):
+        """ Overlap Count Query:
+            Number of intervals that overlap query, without building the list of matches.
+
+            An interval does not overlap query exactly when it starts after it (low > query.high) or ends
+            before it (high < query.low), and both cannot happen at once, so:
+                count = n - #(low > query.high) - #(high < query.low)
+                      = #(low <= query.high) - #(high < query.low)
+            Both terms take one O(log n) descent however many intervals match:
+              - #(low <= query.high) walks down the tree itself, which is ordered by low, adding up the
+                subtree sizes (minus their tombstones) on the left of the path.
+              - #(high < query.low) is the rank of query.low in an order-statistic BTree of the highs. It is
+                built by the first count (O(n log n)) and then kept up to date by insert, delete and update in
+                O(log n) each. Only assigning self.root directly makes the next count build it again.
+        """
+        if self.cache is not None:
+            return self._cached("count", query, lambda: self._countOverlapping(query))
+        return self._countOverlapping(query)
+
+
+    def _countOverlapping(self, query):
+        return self._countLowsAtMost(query.high) - self._sortedHighs().rank(query.low)
+
+
+    def count_many(self, queries):
+        """ Batched count_overlapping: returns the list of counts, one per query interval.
+            O(log n) per query (see count_overlapping).
+        """
+        highs = self._sortedHighs()
+        return [self._countLowsAtMost(query.high) - highs.rank(query.low) for query in queries]
+
+
+    def _countLowsAtMost(self, point):
+        """ Number of live intervals with low <= point, in one descent (from the size and tombstone counts). """
+        count = 0
+        node = self.root
+        while node is not None:
+            if node.interval.low <= point:
+                # Every low on the left is <= node.interval.low (equal lows may be on either side)
+                if node.left is not None:
+                    count += node.left.size - node.left.dead
+                if not node.deleted:
+                    count += 1
+                node = node.right
+            else:
+                node = node.left
+        return count
+
+
+    def _sortedHighs(self):
+        """ Order-statistic BTree of the highs of the live intervals (rank(x) = number of highs < x). Built on
+            first use or after self.root was replaced from outside; insert and delete keep it up to date.
+        """
+        if self._highs is None or self._highs[0] is not self.root:
+            # iterOverlapping over an unbounded query is an iterative in-order walk of the live intervals
+            everything = Interval(float("-inf"), float("inf"))
+            highs = sorted(interval.high for interval in iterOverlapping(self.root, everything))
+            btree = BTree(min_degree=16, order_statistics=True)
+            btree.bulk_load((high, None) for high in highs)
+            self._highs = (self.root, btree)
+        return self._highs[1]
+
+
+    def _trackHighs(self, root, interval, added):
+        """ Apply one insert (added) or delete of interval to the BTree of highs, if it has been built.
+            root is the root before the change: if the BTree belongs to another root it is stale anyway.
+        """
+        if self._highs is None:
+            return
+        highs_root, highs = self._highs
+        if highs_root is not root:
+            self._highs = None
+            return
+        if added:
+            highs.insert((interval.high, None))
+        else:
+            highs.delete(interval.high)
+        self._highs = (self.root, highs)
+
+
+    def freeze(self):
+        """ Return a read-only, array-backed copy of the tree (see IntervalTree_array.ArrayIntervalTree) for
+            batched queries. The ids it reports are positions in the in-order list of intervals.
+        """
+        # NumPy is only needed for the array-backed tree, so it is imported here and not at module level
+        from TreeDataStructure.src.IntervalTree_array import ArrayIntervalTree
+
+        intervals = []
+        self.inOrderTraversal(self.root, intervals)
+        return ArrayIntervalTree.fromIntervals(intervals)
+
+
+    @staticmethod
+    def from_arrays(lows, highs, ids=None):
+        """ Build a balanced interval index straight from NumPy/pandas columns, without creating an Interval
+            or Node object per row and without the recursive buildBalancedTree.
+            The result is a read-only ArrayIntervalTree (see IntervalTree_array.ArrayIntervalTree.from_arrays).
+        """
+        from TreeDataStructure.src.IntervalTree_array import ArrayIntervalTree
+
+        return ArrayIntervalTree.from_arrays(lows, highs, ids)
 
 
     def printTree(self, node=None, level=0, prefix="Root: "):
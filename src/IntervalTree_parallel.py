@@ -0,0 +1,131 @@
+"""
+    Parallel Query Executor:
+    Runs batched overlap queries (ArrayIntervalTree.query_many) on several processes at once.
+
+    The arrays of the tree (low, high, max, ids, and the sorted endpoints used by count_many) are copied once
+    into multiprocessing.shared_memory blocks. Every worker process attaches to the blocks when it starts and
+    wraps them in an ArrayIntervalTree without copying or sorting anything, so the tree itself is never pickled. Only the query chunks and their results travel
+    between processes, and the results are merged back in query order.
+
+    Usage:
+        with ParallelQueryExecutor(tree, processes=8) as executor:
+            offsets, ids = executor.query_many(lows, highs)
+"""
+
+import numpy as np
+from multiprocessing import Pool, shared_memory
+
+from TreeDataStructure.src.IntervalTree_array import ArrayIntervalTree
+
+
+# Per-worker state, set by _attachWorker when the worker process starts
+_worker_blocks = None
+_worker_tree = None
+
+
+def _attachWorker(layout):
+    """ Pool initializer: attach to the shared blocks and build a zero-copy view of the tree. """
+    global _worker_blocks, _worker_tree
+    _worker_blocks = [shared_memory.SharedMemory(name=name) for name, _, _ in layout]
+    arrays = [np.ndarray((length,), dtype=dtype, buffer=block.buf)
+              for block, (_, dtype, length) in zip(_worker_blocks, layout)]
+    _worker_tree = ArrayIntervalTree.fromLayout(*arrays)
+
+
+def _queryChunk(chunk):
+    """ Answer one chunk of queries in a worker; returns (matches per query, matched ids). """
+    lows, highs = chunk
+    offsets, ids = _worker_tree.query_many(lows, highs)
+    return np.diff(offsets), ids
+
+
+def _countChunk(chunk):
+    lows, highs = chunk
+    return _worker_tree.count_many(lows, highs)
+
+
+class ParallelQueryExecutor:
+    def __init__(self, tree, processes=None, chunk_size=2048):
+        """
+            Params:
+              - tree: The ArrayIntervalTree to query (e.g. BalancedIntervalTree.from_arrays(...)).
+              - processes: Number of worker processes (defaults to the number of CPUs).
+              - chunk_size: Number of queries sent to a worker at a time.
+        """
+        self.tree = tree
+        self.processes = processes
+        self.chunk_size = chunk_size
+        self.blocks = []
+        self.pool = None
+
+
+    def start(self):
+        """ Copy the tree into shared memory and start the worker processes. The sorted endpoint arrays are
+            built here, once, instead of by every worker. If anything fails, the blocks created so far are released.
+        """
+        if self.pool is not None:
+            return
+        sorted_lows, sorted_highs = self.tree.sortedEndpoints()
+        # In the order of the arguments of ArrayIntervalTree.fromLayout
+        arrays = (self.tree.low, self.tree.high, self.tree.max, self.tree.ids, sorted_lows, sorted_highs)
+        layout = []
+        try:
+            for array in arrays:
+                block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+                self.blocks.append(block)
+                np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[:] = array
+                layout.append((block.name, array.dtype, len(array)))
+            self.pool = Pool(self.processes, initializer=_attachWorker, initargs=(layout,))
+        except BaseException:
+            self.close()
+            raise
+
+
+    def close(self):
+        """ Stop the workers and release the shared memory. """
+        if self.pool is not None:
+            self.pool.close()
+            self.pool.join()
+            self.pool = None
+        for block in self.blocks:
+            block.close()
+            block.unlink()
+        self.blocks = []
+
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+    def _chunks(self, lows, highs):
+        lows = np.asarray(lows)
+        highs = np.asarray(highs)
+        if lows.shape != highs.shape or lows.ndim != 1:
+            raise ValueError("lows and highs must be one-dimensional arrays of the same length")
+        return [(lows[start:start + self.chunk_size], highs[start:start + self.chunk_size])
+                for start in range(0, len(lows), self.chunk_size)]
+
+
+    def query_many(self, lows, highs):
+        """ Same result as ArrayIntervalTree.query_many: (offsets, ids) in CSR form, in query order. """
+        self.start()
+        results = self.pool.map(_queryChunk, self._chunks(lows, highs))
+
+        offsets = np.zeros(len(lows) + 1, dtype=np.intp)
+        if results:
+            np.cumsum(np.concatenate([counts for counts, _ in results]), out=offsets[1:])
+            ids = np.concatenate([chunk_ids for _, chunk_ids in results])
+        else:
+            ids = self.tree.ids[:0]
+        return offsets, ids
+
+
+    def count_many(self, lows, highs):
+        """ Same result as ArrayIntervalTree.count_many, computed by the workers. """
+        self.start()
+        results = self.pool.map(_countChunk, self._chunks(lows, highs))
+        return np.concatenate(results) if results else np.zeros(0, dtype=np.intp)
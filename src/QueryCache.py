@@ -0,0 +1,61 @@
+"""
+    LRU Query Cache:
+    Dashboards ask the same query windows again and again, so the answers can be kept and reused.
+
+    - Entries are keyed by the normalized query (query kind, low, high).
+    - Memory is bounded: at most maxsize entries, the least recently used one is evicted first
+      (an OrderedDict keeps the entries in recency order).
+    - Invalidation is cheap: every entry remembers the version of the tree it was computed on. When the tree
+      changes its version changes, so old entries simply stop matching (they are counted as misses,
+      overwritten on the next put, or evicted). Nothing has to be scanned or cleared.
+"""
+
+from collections import OrderedDict
+
+
+class QueryCache:
+    MISSING = object()      # Returned by get when there is no valid entry (None can be a cached answer)
+
+    def __init__(self, maxsize=1024):
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self.maxsize = maxsize
+        self.entries = OrderedDict()     # key -> (version, value), least recently used first
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+
+    def get(self, key, version):
+        entry = self.entries.get(key)
+        if entry is None or entry[0] != version:
+            self.misses += 1
+            return self.MISSING
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+
+    def put(self, key, version, value):
+        self.entries[key] = (version, value)
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+            self.evictions += 1
+
+
+    def clear(self):
+        self.entries.clear()
+
+
+    def stats(self):
+        """ Hit/miss statistics, to size the cache. """
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self.entries),
+            "maxsize": self.maxsize,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
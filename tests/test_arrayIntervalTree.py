@@ -0,0 +1,103 @@
+import sys
+sys.path.append('../')
+
+
+import random
+import unittest
+import numpy as np
+from src.IntervalTree_array import ArrayIntervalTree
+from src.IntervalTree import Interval
+
+
+
+class TestArrayIntervalTree(unittest.TestCase):
+    def setUp(self):
+        random.seed(3)
+        self.intervals = []
+        for _ in range(500):
+            low = random.randint(0, 2000)
+            self.intervals.append(Interval(low, low + random.randint(0, 90)))
+        self.idx = ArrayIntervalTree.fromIntervals(self.intervals)
+
+
+    def brute_force(self, low, high):
+        return [row for row, interval in enumerate(self.intervals) if interval.low <= high and low <= interval.high]
+
+
+    def test_layout(self):
+        n = len(self.idx)
+        self.assertEqual(n, len(self.intervals))
+
+        # In-order traversal of the implicit tree visits the lows in sorted order
+        in_order = []
+        stack, slot = [], 0
+        while stack or slot < n:
+            while slot < n:
+                stack.append(slot)
+                slot = 2 * slot + 1
+            slot = stack.pop()
+            in_order.append(self.idx.low[slot])
+            slot = 2 * slot + 2
+        self.assertEqual(in_order, sorted(interval.low for interval in self.intervals))
+
+        for slot in range(n):
+            children = [child for child in (2 * slot + 1, 2 * slot + 2) if child < n]
+            expected = max([self.idx.high[slot]] + [self.idx.max[child] for child in children])
+            self.assertEqual(self.idx.max[slot], expected)
+
+
+    def test_query_many(self):
+        lows = np.array([random.randint(-100, 2100) for _ in range(300)])
+        highs = lows + np.array([random.randint(0, 60) for _ in range(300)])
+        offsets, ids = self.idx.query_many(lows, highs, chunk_size=64)
+
+        self.assertEqual(len(offsets), len(lows) + 1)
+        for j in range(len(lows)):
+            self.assertEqual(sorted(ids[offsets[j]:offsets[j + 1]]), self.brute_force(lows[j], highs[j]))
+
+
+    def test_from_arrays(self):
+        lows = np.array([interval.low for interval in self.intervals])
+        highs = np.array([interval.high for interval in self.intervals])
+        ids = np.arange(len(lows)) * 10
+        idx = ArrayIntervalTree.from_arrays(lows, highs, ids)
+
+        offsets, matched = idx.query_many([100, 1500], [150, 1500])
+        self.assertEqual(sorted(matched[offsets[0]:offsets[1]]), [row * 10 for row in self.brute_force(100, 150)])
+        self.assertEqual(sorted(matched[offsets[1]:offsets[2]]), [row * 10 for row in self.brute_force(1500, 1500)])
+
+        with self.assertRaises(ValueError):
+            ArrayIntervalTree.from_arrays(lows, highs, ids[:-1])
+
+
+    def test_from_datetime_arrays(self):
+        admissions = np.array(["2017-04-01", "2017-04-03", "2017-05-10"], dtype="datetime64[D]")
+        discharges = np.array(["2017-04-05", "2017-04-04", "2017-05-12"], dtype="datetime64[D]")
+        idx = ArrayIntervalTree.from_arrays(admissions, discharges)
+
+        offsets, ids = idx.query_many(np.array(["2017-04-04"], dtype="datetime64[D]"),
+                                      np.array(["2017-04-30"], dtype="datetime64[D]"))
+        self.assertEqual(sorted(ids), [0, 1])
+
+
+    def test_count_many(self):
+        lows = np.array([random.randint(-100, 2100) for _ in range(300)])
+        highs = lows + np.array([random.randint(0, 60) for _ in range(300)])
+        counts = self.idx.count_many(lows, highs)
+        offsets, _ = self.idx.query_many(lows, highs)
+        self.assertEqual(list(counts), list(np.diff(offsets)))
+        self.assertEqual(self.idx.count_overlapping(100, 150), len(self.brute_force(100, 150)))
+
+
+    def test_empty(self):
+        offsets, ids = ArrayIntervalTree([], []).query_many([1, 2], [3, 4])
+        self.assertEqual(list(offsets), [0, 0, 0])
+        self.assertEqual(len(ids), 0)
+
+        offsets, ids = self.idx.query_many([], [])
+        self.assertEqual(list(offsets), [0])
+
+
+
+if __name__ == "__main__":
+    unittest.main()
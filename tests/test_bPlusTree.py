@@ -0,0 +1,59 @@
+import sys
+sys.path.append('../')
+
+
+import random
+import unittest
+from src.BPlusTree import BPlusTree
+
+
+
+class TestBPlusTree(unittest.TestCase):
+    def setUp(self):
+        self.tree = BPlusTree(min_degree=2)
+        self.keys = list(range(0, 400, 2))
+        random.seed(4)
+        random.shuffle(self.keys)
+        for key in self.keys:
+            self.tree.insert((key, str(key)))
+
+
+    def test_search(self):
+        for key in range(0, 400, 2):
+            leaf, index = self.tree.search(key)
+            self.assertEqual(leaf.values[index], str(key))
+        self.assertIsNone(self.tree.search(3))
+        self.assertIsNone(self.tree.search(1000))
+
+
+    def test_leaf_chain(self):
+        leaf = self.tree.root
+        while not leaf.is_leaf:
+            leaf = leaf.children[0]
+        keys = []
+        while leaf is not None:
+            keys.extend(leaf.keys)
+            leaf = leaf.next
+        self.assertEqual(keys, sorted(self.keys))
+
+
+    def test_items_and_range(self):
+        self.assertEqual([key for key, _ in self.tree.items()], sorted(self.keys))
+        self.assertEqual([key for key, _ in self.tree.items(from_key=391)], [392, 394, 396, 398])
+        self.assertEqual(list(self.tree.range(11, 17)), [(12, "12"), (14, "14"), (16, "16")])
+        self.assertEqual(list(self.tree.range(401, 500)), [])
+
+
+    def test_duplicates(self):
+        tree = BPlusTree(min_degree=2)
+        for value in range(20):
+            tree.insert((5, value))
+        tree.insert((4, "a"))
+        tree.insert((6, "b"))
+        self.assertEqual(len(list(tree.range(5, 5))), 20)
+        self.assertEqual([key for key, _ in tree.items()], [4] + [5] * 20 + [6])
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,211 @@
+import sys
+sys.path.append('../')
+
+
+import random
+import unittest
+from array import array
+from src.BTree_BalancedTree import BTree
+
+
+
+class TestBTree(unittest.TestCase):
+    def setUp(self):
+        self.btree = BTree(min_degree=3)
+        self.keys = list(range(200))
+        random.seed(2)
+        random.shuffle(self.keys)
+        for key in self.keys:
+            self.btree.insert((key, 2 * key))
+
+
+    def check_invariants(self, node, low=None, high=None, is_root=True):
+        """ Returns the height of the subtree and checks the B-tree invariants on the way. """
+        keys = list(node.keys)
+        self.assertEqual(len(node.values), len(keys))
+        self.assertEqual(keys, sorted(keys))
+        self.assertLessEqual(len(keys), self.btree.MAX_KEYS)
+        if not is_root:
+            self.assertGreaterEqual(len(keys), self.btree.MIN_KEYS)
+        if keys and low is not None:
+            self.assertGreaterEqual(keys[0], low)
+        if keys and high is not None:
+            self.assertLessEqual(keys[-1], high)
+        if node.is_leaf:
+            self.assertEqual(node.children, [])
+            return 1
+
+        self.assertEqual(len(node.children), len(keys) + 1)
+        bounds = [low] + keys + [high]
+        heights = {self.check_invariants(child, bounds[i], bounds[i + 1], False) for i, child in enumerate(node.children)}
+        self.assertEqual(len(heights), 1)
+        return heights.pop() + 1
+
+
+    def test_insert_and_search(self):
+        self.check_invariants(self.btree.root)
+        for key in range(200):
+            node, index = self.btree.search(key)
+            self.assertEqual((node.keys[index], node.values[index]), (key, 2 * key))
+        self.assertIsNone(self.btree.search(200))
+        self.assertIsNone(self.btree.root.counts)     # no per-node counts list without order statistics
+
+
+    def test_search_many(self):
+        probes = [random.randrange(-10, 210) for _ in range(1000)] + [5, 5, 199, 0]
+        self.assertEqual(self.btree.search_many(probes), [self.btree.search(key) for key in probes])
+        self.assertEqual(self.btree.search_many([]), [])
+        self.assertEqual(BTree(min_degree=2).search_many([1, 2]), [None, None])
+
+
+    def test_items_and_range(self):
+        self.assertEqual([key for key, _ in self.btree.items()], list(range(200)))
+        self.assertEqual([key for key, _ in self.btree.items(from_key=195)], [195, 196, 197, 198, 199])
+        self.assertEqual(list(self.btree.range(10, 13)), [(10, 20), (11, 22), (12, 24), (13, 26)])
+        self.assertEqual(list(self.btree.range(300, 400)), [])
+
+        # The iterator is lazy: taking the first pairs does not walk the whole tree
+        iterator = self.btree.items(50)
+        self.assertEqual(next(iterator), (50, 100))
+        self.assertEqual(next(iterator), (51, 102))
+
+
+    def test_equal_keys_keep_insertion_order(self):
+        self.btree = BTree(min_degree=2)
+        for i in range(200):
+            self.btree.insert((i % 7, i))
+        self.check_invariants(self.btree.root)
+        expected = sorted(((i % 7, i) for i in range(200)), key=lambda pair: pair[0])   # stable sort
+        self.assertEqual(list(self.btree.items()), expected)
+
+
+    def test_delete(self):
+        to_delete = self.keys[:150]
+        for count, key in enumerate(to_delete):
+            self.assertTrue(self.btree.delete(key))
+            self.assertIsNone(self.btree.search(key))
+            if count % 10 == 0:
+                self.check_invariants(self.btree.root)
+        self.assertFalse(self.btree.delete(to_delete[0]))
+
+        for key in self.keys[150:]:
+            self.assertIsNotNone(self.btree.search(key))
+        self.check_invariants(self.btree.root)
+
+
+    def test_bulk_load(self):
+        for min_degree in (2, 3, 8):
+            for n in (0, 1, 2, 5, 17, 100, 1001):
+                for fill_factor in (0.1, 0.5, 0.7, 1.0):
+                    self.btree = BTree(min_degree=min_degree)
+                    self.btree.bulk_load(((key, -key) for key in range(n)), fill_factor=fill_factor)
+                    self.check_invariants(self.btree.root)
+                    self.assertEqual(list(self.btree.items()), [(key, -key) for key in range(n)])
+
+        # Slack left in the nodes absorbs inserts, and the tree keeps working normally
+        self.btree = BTree(min_degree=4)
+        self.btree.bulk_load([(key, key) for key in range(0, 2000, 2)], fill_factor=0.5)
+        self.assertLessEqual(max(len(leaf.keys) for leaf in self.btree.root.children[0].children), 4)
+        for key in range(1, 2000, 2):
+            self.btree.insert((key, key))
+        for key in range(0, 2000, 3):
+            self.assertTrue(self.btree.delete(key))
+        self.check_invariants(self.btree.root)
+        self.assertEqual([key for key, _ in self.btree.items()], [key for key in range(2000) if key % 3])
+
+        with self.assertRaises(ValueError):
+            self.btree.bulk_load([(2, 2), (1, 1)])
+
+
+    def check_counts(self, node):
+        """ Returns the number of keys under node and checks the subtree counts on the way. """
+        if node.is_leaf:
+            self.assertEqual(node.counts, [])
+            return len(node.keys)
+        sizes = [self.check_counts(child) for child in node.children]
+        self.assertEqual(node.counts, sizes)
+        return len(node.keys) + sum(sizes)
+
+
+    def test_order_statistics(self):
+        with self.assertRaises(ValueError):
+            self.btree.rank(5)
+
+        self.btree = BTree(min_degree=2, order_statistics=True)
+        keys = sorted(self.keys + [50, 50, 120])       # a few duplicates
+        for key in self.keys + [50, 50, 120]:
+            self.btree.insert((key, -key))
+        self.assertEqual(self.check_counts(self.btree.root), len(keys))
+
+        for key in (-1, 0, 50, 51, 120, 199, 250):
+            self.assertEqual(self.btree.rank(key), sum(1 for other in keys if other < key))
+            self.assertEqual(self.btree.rank(key, inclusive=True), sum(1 for other in keys if other <= key))
+        self.assertEqual([self.btree.select(k)[0] for k in range(len(keys))], keys)
+        self.assertEqual(self.btree.select(-1), (199, -199))
+        with self.assertRaises(IndexError):
+            self.btree.select(len(keys))
+        self.assertEqual(self.btree.count_range(40, 60), 23)
+        self.assertEqual(self.btree.count_range(60, 40), 0)
+        self.assertEqual(self.btree.percentile(50), keys[101])       # nearest rank: ceil(0.5 * 203) = 102
+        self.assertEqual(self.btree.percentile(100), 199)
+
+        # The counts follow deletes (borrows, merges, root collapse)
+        random.seed(3)
+        for key in random.sample(keys, 150):
+            self.assertTrue(self.btree.delete(key))
+            keys.remove(key)
+            self.assertFalse(self.btree.delete(1000))
+        self.assertEqual(self.check_counts(self.btree.root), len(keys))
+        self.assertEqual([self.btree.select(k)[0] for k in range(len(keys))], keys)
+        for key in keys:
+            self.btree.delete(key)
+        self.assertEqual(self.check_counts(self.btree.root), 0)
+
+        self.btree = BTree(min_degree=3, order_statistics=True)
+        self.btree.bulk_load([(key, key) for key in range(1000)])
+        self.assertEqual(self.check_counts(self.btree.root), 1000)
+        self.assertEqual(self.btree.rank(500), 500)
+
+
+    def test_typed_arrays(self):
+        with self.assertRaises(ValueError):
+            BTree(min_degree=3, key_typecode="x")
+
+        self.btree = BTree(min_degree=3, order_statistics=True, key_typecode="q", value_typecode="d")
+        for key in self.keys:
+            self.btree.insert((key, key / 2))
+        self.assertEqual(type(self.btree.root.keys), array)
+        self.assertEqual(self.btree.root.values.typecode, "d")
+        for key in self.keys[:120]:
+            self.assertTrue(self.btree.delete(key))
+        self.check_invariants(self.btree.root)
+        self.assertEqual(list(self.btree.items()), [(key, key / 2) for key in sorted(self.keys[120:])])
+        self.assertEqual(self.btree.select(0), (min(self.keys[120:]), min(self.keys[120:]) / 2))
+        node, index = self.btree.search(self.keys[150])
+        self.assertEqual(node.values[index], self.keys[150] / 2)
+        with self.assertRaises(TypeError):
+            self.btree.insert(("text", 1.0))
+
+        self.btree.bulk_load((key, key) for key in range(1000))
+        self.check_invariants(self.btree.root)
+        self.assertEqual(type(self.btree.root.children[0].keys), array)
+        self.assertEqual(self.btree.search_many([5, 5000])[1], None)
+
+
+    def test_delete_shrinks_root(self):
+        height = self.check_invariants(self.btree.root)
+        for key in self.keys:
+            self.btree.delete(key)
+        self.assertTrue(self.btree.root.is_leaf)
+        self.assertEqual(self.btree.root.keys, [])
+        self.assertGreater(height, 1)
+
+        # The tree is still usable after shrinking
+        self.btree.insert((7, 14))
+        node, index = self.btree.search(7)
+        self.assertEqual((node.keys[index], node.values[index]), (7, 14))
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,8 +3,10 @@ import sys
 
 sys.path.append('../')
 
+import math
+import random
 import unittest
-from src.BinaryTree import TreeNode, UnbalancedBinaryTree, BalancedBinaryTree
+from src.BinaryTree import TreeNode, UnbalancedBinaryTree, BalancedBinaryTree, AVLBinaryTree
 
 
 class TestBinaryTree(unittest.TestCase):
@@ -49,6 +51,233 @@ class TestBinaryTree(unittest.TestCase):
         self.assertEqual(pre_order_result, expected_result)
 
 
+    def test_unbalanced_sorted_insert(self):
+        # A right-skewed chain deeper than the recursion limit
+        for el in range(5000):
+            self.unbalanced_tree.insert(el)
+        node = self.unbalanced_tree.root
+        depth = 0
+        while node is not None:
+            depth += 1
+            node = node.right
+        self.assertEqual(depth, 5000)
+
+
+    def test_dsw_rebalance(self):
+        for size in (0, 1, 2, 3, 7, 8, 100):
+            tree = BalancedBinaryTree()
+            for el in range(size):
+                tree.insert(el)
+            root = tree.dswRebalance()
+            self.assertIs(tree.root, root)
+            self.assertEqual(height(root), size.bit_length())     # minimum height: ceil(log2(size + 1))
+            self.assertEqual(tree.inOrderTraversal(), list(range(size)))
+
+        # A subtree is rebalanced on its own: the rest of the tree stays, the caller links the result back in
+        tree = BalancedBinaryTree()
+        for el in [5, 3, 8, 1, 4]:
+            tree.insert(el)
+        root = tree.root
+        tree.root.left = tree.dswRebalance(tree.root.left)
+        self.assertIs(tree.root, root)
+        self.assertEqual(tree.inOrderTraversal(), [1, 3, 4, 5, 8])
+
+        # A left-skewed chain far deeper than the recursion limit (built directly: inserting it is O(n^2))
+        root = None
+        for el in range(200000):
+            node = TreeNode(el)
+            node.left = root
+            root = node
+        root = self.balanced_tree.dswRebalance(root)
+        self.assertEqual(height(root), 18)
+        self.assertIsNone(self.balanced_tree.root)     # not this tree's root: self.root is left alone
+
+
+    def test_scapegoat_sorted_insert(self):
+        for alpha in (0.6, 0.75):
+            tree = BalancedBinaryTree(scapegoat=True, alpha=alpha)
+            for size in range(1, 3001):
+                tree.insert(size)
+                self.assertLessEqual(height(tree.root), math.log(size) / math.log(1 / alpha) + 1)
+            self.assertEqual(tree.inOrderTraversal(), list(range(1, 3001)))
+            self.check_sizes(tree.root)
+
+        # Rebuilds stay local: after a sorted run on the right, the left part of the tree is left as it was
+        tree = BalancedBinaryTree(scapegoat=True)
+        for el in range(0, 2000, 2):
+            tree.insert(el)
+        left = tree.root.left
+        for el in range(2000, 2100):
+            tree.insert(el)
+        self.assertIs(tree.root.left, left)
+
+
+    def test_scapegoat_after_dsw_rebalance(self):
+        random.seed(14)
+        tree = BalancedBinaryTree(scapegoat=True)
+        values = [random.randrange(1000) for _ in range(200)]
+        for value in values:
+            tree.insert(value)
+        tree.dswRebalance()
+        self.check_sizes(tree.root)
+        tree.root.right = tree.dswRebalance(tree.root.right)
+        self.check_sizes(tree.root)
+
+        # The sizes stay right, so inserts keep working from them
+        for el in range(1000, 2000):
+            tree.insert(el)
+            self.assertLessEqual(height(tree.root), math.log(tree.root.size) / math.log(1 / tree.alpha) + 1)
+        self.check_sizes(tree.root)
+        self.assertEqual(tree.inOrderTraversal(), sorted(values) + list(range(1000, 2000)))
+
+
+    def test_scapegoat_delete(self):
+        random.seed(13)
+        values = [random.randrange(500) for _ in range(1000)]
+        tree = BalancedBinaryTree(scapegoat=True)
+        for value in values:
+            tree.insert(value)
+        for value in values[:600]:
+            self.assertTrue(tree.delete(value))
+        self.assertFalse(tree.delete(-1))
+        self.assertEqual(tree.inOrderTraversal(), sorted(values[600:]))
+        self.check_sizes(tree.root)
+        with self.assertRaises(ValueError):
+            BalancedBinaryTree(scapegoat=True, alpha=0.5)
+
+
+    def check_sizes(self, node):
+        if node is None:
+            return 0
+        size = 1 + self.check_sizes(node.left) + self.check_sizes(node.right)
+        self.assertEqual(node.size, size)
+        return size
+
+
+def height(root):
+    """ Height of a tree, level by level (no recursion). """
+    levels = 0
+    level = [root] if root is not None else []
+    while level:
+        levels += 1
+        level = [child for node in level for child in (node.left, node.right) if child is not None]
+    return levels
+
+
+class TestAVLBinaryTree(unittest.TestCase):
+    def check_avl(self, node):
+        """ Returns the height of the subtree and checks the AVL invariants on the way. """
+        if node is None:
+            return 0
+        left, right = self.check_avl(node.left), self.check_avl(node.right)
+        self.assertLessEqual(abs(left - right), 1)
+        self.assertEqual(node.height, max(left, right) + 1)
+        return node.height
+
+
+    def test_sorted_insert_stays_balanced(self):
+        tree = AVLBinaryTree()
+        for el in range(10000):
+            tree.insert(el)
+        self.assertLessEqual(tree.root.height, 1.45 * math.log2(10000))
+        self.assertEqual(tree.inOrderTraversal(), list(range(10000)))
+        self.assertEqual(tree.search(1234).data, 1234)
+        self.assertIsNone(tree.search(10000))
+
+
+    def test_insert_and_delete(self):
+        tree = AVLBinaryTree()
+        random.seed(5)
+        values = [random.randrange(300) for _ in range(600)]   # with duplicates
+        for value in values:
+            tree.insert(value)
+        self.check_avl(tree.root)
+        self.assertEqual(tree.inOrderTraversal(), sorted(values))
+
+        for value in values[:450]:
+            self.assertTrue(tree.delete(value))
+            values.remove(value)
+        self.assertFalse(tree.delete(1000))
+        self.check_avl(tree.root)
+        self.assertEqual(tree.inOrderTraversal(), sorted(values))
+
+        for value in list(values):
+            tree.delete(value)
+        self.assertIsNone(tree.root)
+
+
+class TestBinarySearchTreeQueries(unittest.TestCase):
+    def build(self, tree_class, values):
+        if tree_class is BalancedBinaryTree:
+            unbalanced_tree = UnbalancedBinaryTree()
+            for value in values:
+                unbalanced_tree.insert(value)
+            tree = BalancedBinaryTree()
+            tree.root = tree._buildBalancedTree(unbalanced_tree.root)
+            return tree
+        tree = tree_class()
+        for value in values:
+            tree.insert(value)
+        return tree
+
+
+    def check_queries(self, tree, values):
+        # Probes below, between, on and above the values (even numbers, so odd probes are missing keys)
+        for probe in range(-3, 2 * 60 + 4):
+            self.assertEqual(tree.contains(probe), probe in values)
+            self.assertEqual(tree.floor(probe), max((v for v in values if v <= probe), default=None))
+            self.assertEqual(tree.ceiling(probe), min((v for v in values if v >= probe), default=None))
+            self.assertEqual(tree.predecessor(probe), max((v for v in values if v < probe), default=None))
+            self.assertEqual(tree.successor(probe), min((v for v in values if v > probe), default=None))
+            expected = min(values, key=lambda v: (abs(v - probe), v)) if values else None
+            self.assertEqual(tree.nearest(probe), expected)
+
+
+    def test_queries(self):
+        random.seed(11)
+        values = [2 * random.randrange(60) for _ in range(80)]   # with duplicates
+        for tree_class in (UnbalancedBinaryTree, BalancedBinaryTree, AVLBinaryTree):
+            tree = self.build(tree_class, values)
+            self.check_queries(tree, values)
+            # Both ends
+            self.assertIsNone(tree.predecessor(min(values)))
+            self.assertEqual(tree.floor(min(values)), min(values))
+            self.assertIsNone(tree.successor(max(values)))
+            self.assertEqual(tree.ceiling(max(values)), max(values))
+            self.assertEqual(tree.nearest(-100), min(values))
+            self.assertEqual(tree.nearest(1000), max(values))
+
+
+    def test_empty_tree(self):
+        for tree_class in (UnbalancedBinaryTree, BalancedBinaryTree, AVLBinaryTree):
+            tree = tree_class()
+            self.assertFalse(tree.contains(1))
+            self.assertIsNone(tree.floor(1))
+            self.assertIsNone(tree.ceiling(1))
+            self.assertIsNone(tree.predecessor(1))
+            self.assertIsNone(tree.successor(1))
+            self.assertIsNone(tree.nearest(1))
+            self.assertFalse(tree.delete(1))
+
+
+    def test_delete(self):
+        random.seed(12)
+        values = [2 * random.randrange(60) for _ in range(80)]
+        for tree_class in (UnbalancedBinaryTree, BalancedBinaryTree, AVLBinaryTree):
+            remaining = list(values)
+            tree = self.build(tree_class, values)
+            # The smallest and the largest value first, then the rest in random order
+            for value in [min(values), max(values)] + values[:50]:
+                if value in remaining:
+                    self.assertTrue(tree.delete(value))
+                    remaining.remove(value)
+                else:
+                    self.assertFalse(tree.delete(value))
+            self.assertFalse(tree.delete(1))
+            self.assertEqual(tree.inOrderTraversal(), sorted(remaining))
+            self.check_queries(tree, remaining)
+
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,135 @@
+import sys
+sys.path.append('../')
+
+
+import contextlib
+import io
+import random
+import threading
+import unittest
+from src.BTree_CopyOnWrite import CopyOnWriteBTree
+
+
+
+def all_nodes(node):
+    nodes = [node]
+    for child in node.children:
+        nodes.extend(all_nodes(child))
+    return nodes
+
+
+class TestCopyOnWriteBTree(unittest.TestCase):
+    def setUp(self):
+        self.btree = CopyOnWriteBTree(min_degree=3)
+        self.keys = list(range(300))
+        random.seed(8)
+        random.shuffle(self.keys)
+        for key in self.keys:
+            self.btree.insert((key, key))
+
+
+    def test_snapshot_is_isolated(self):
+        snapshot = self.btree.snapshot()
+        for key in self.keys[:200]:
+            self.assertTrue(self.btree.delete(key))
+        for key in range(300, 400):
+            self.btree.insert((key, key))
+
+        self.assertEqual([key for key, _ in snapshot.items()], list(range(300)))
+        self.assertIsNotNone(snapshot.search(self.keys[0]))
+        self.assertEqual([key for key, _ in self.btree.items()], sorted(self.keys[200:]) + list(range(300, 400)))
+        self.assertIsNone(self.btree.search(self.keys[0]))
+        with self.assertRaises(TypeError):
+            snapshot.insert((1, 1))
+
+
+    def test_write_copies_only_what_it_touches(self):
+        before = {id(node) for node in all_nodes(self.btree.published_root)}
+        self.btree.insert((1000, 1000))
+        after = all_nodes(self.btree.published_root)
+        copied = [node for node in after if id(node) not in before]
+        self.assertLess(len(copied), 10)
+        self.assertGreater(len(after), 50)
+
+
+    def test_order_statistics_on_snapshots(self):
+        self.btree = CopyOnWriteBTree(min_degree=3, order_statistics=True)
+        for key in self.keys:
+            self.btree.insert((key, key))
+        snapshot = self.btree.snapshot()
+        for key in range(100):
+            self.btree.delete(key)
+        self.assertEqual(snapshot.rank(150), 150)
+        self.assertEqual(self.btree.rank(150), 50)
+        self.assertEqual(self.btree.select(0), (100, 100))
+        self.assertEqual(self.btree.count_range(0, 149), 50)
+
+
+    def test_failed_write_publishes_nothing(self):
+        snapshot = self.btree.snapshot()
+        with self.assertRaises(ValueError):
+            self.btree.bulk_load([(2, 2), (1, 1)])
+        self.assertIs(self.btree.published_root, snapshot.root)
+        self.assertEqual(len(list(self.btree.items())), 300)
+
+
+    def test_explicit_node_reads_during_a_write(self):
+        # A write that waits in the middle, while another thread reads through child() (search from a node,
+        # printBTree): the reads must not copy anything into the published tree
+        published = self.btree.published_root
+        before = [(id(node), list(node.keys), list(node.children)) for node in all_nodes(published)]
+        started, resume = threading.Event(), threading.Event()
+
+        def slow_insert(key):
+            super(CopyOnWriteBTree, self.btree).insert(key)
+            started.set()
+            resume.wait()
+
+        writer = threading.Thread(target=self.btree._write, args=(slow_insert, (1000, 1000)))
+        writer.start()
+        started.wait()
+        for key in self.keys:
+            self.assertIsNotNone(self.btree.search(key, published))
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.btree.printBTree(published)
+        resume.set()
+        writer.join()
+
+        self.assertEqual([(id(node), list(node.keys), list(node.children)) for node in all_nodes(published)], before)
+        self.assertIsNotNone(self.btree.search(1000))
+
+
+    def test_readers_during_writes(self):
+        errors = []
+        done = threading.Event()
+
+        def reader():
+            while not done.is_set():
+                snapshot = self.btree.snapshot()
+                keys = [key for key, _ in snapshot.items()]
+                # Every write keeps the keys 0..299 and adds or removes one larger key
+                if keys != sorted(keys) or keys[:300] != list(range(300)):
+                    errors.append(keys)
+                    return
+                if snapshot.search_many([keys[-1]])[0] is None:
+                    errors.append(keys[-1])
+                    return
+
+        readers = [threading.Thread(target=reader) for _ in range(3)]
+        for thread in readers:
+            thread.start()
+        for key in range(300, 1300):
+            self.btree.insert((key, key))
+            if key % 3 == 0:
+                self.btree.delete(key)
+        done.set()
+        for thread in readers:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(len(list(self.btree.items())), 300 + 1000 - 334)
+
+
+
+if __name__ == "__main__":
+    unittest.main()
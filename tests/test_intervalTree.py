@@ -2,9 +2,11 @@ import sys
 sys.path.append('../')
 
 
+import math
+import random
 import unittest
 from src.IntervalTree_balanced import BalancedIntervalTree
-from src.IntervalTree import Node, Interval
+from src.IntervalTree import Node, Interval, UnbalancedIntervalTree
 
 
 
@@ -91,12 +93,270 @@ class TestIntervalTree(unittest.TestCase):
         self.assertEqual(result, Interval(30, 40))
 
 
+    def test_avl_insert_sorted_intervals(self):
+        # Intervals arriving sorted by low would turn a plain BST into a linked list
+        tree = BalancedIntervalTree(balance="avl")
+        for low in range(1000):
+            tree.insert(Interval(low, low + (low % 7) * 3))
 
+        self.assertLessEqual(tree.root.height, 14)   # 1.44 * log2(1000)
 
+        def check(node):
+            if node is None:
+                return 0, float("-inf")
+            left_height, left_max = check(node.left)
+            right_height, right_max = check(node.right)
+            self.assertLessEqual(abs(left_height - right_height), 1)
+            self.assertEqual(node.height, 1 + max(left_height, right_height))
+            self.assertEqual(node.max, max(node.interval.high, left_max, right_max))
+            return node.height, node.max
 
+        check(tree.root)
+
+        in_order_result = []
+        tree.inOrderTraversal(tree.root, in_order_result)
+        self.assertEqual([interval.low for interval in in_order_result], list(range(1000)))
+
+        result = tree.isOverlapping(tree.root, Interval(500, 500))
+        self.assertTrue(result.low <= 500 <= result.high)
+
+
+    def test_scapegoat_insert_sorted_intervals(self):
+        tree = BalancedIntervalTree(balance="scapegoat", alpha=0.7)
+        for low in range(1, 2001):
+            tree.insert(Interval(low, low + (low % 7) * 3))
+            self.assertLessEqual(self.height(tree.root), math.log(low) / math.log(1 / 0.7) + 1)
+        self.check_max(tree.root)
+        self.assertEqual(tree.root.size, 2000)
+
+        in_order_result = []
+        tree.inOrderTraversal(tree.root, in_order_result)
+        self.assertEqual([interval.low for interval in in_order_result], list(range(1, 2001)))
+        self.assertEqual(sorted(iv.low for iv in tree.find_all_overlapping(Interval(500, 500))),
+                         [low for low in range(482, 501) if low + (low % 7) * 3 >= 500])
+
+        # Deletes and tombstones keep working on the rebuilt subtrees
+        tree = BalancedIntervalTree(balance="scapegoat", tombstones=True)
+        for low in range(300):
+            tree.insert(Interval(low, low + 1))
+        for low in range(0, 300, 2):
+            self.assertTrue(tree.delete(Interval(low, low + 1)))
+        for low in range(300, 400):
+            tree.insert(Interval(low, low + 1))
+        self.check_max(tree.root)
+        self.assertEqual(len(list(tree.find_all_overlapping(Interval(0, 500)))), 250)
+        with self.assertRaises(ValueError):
+            BalancedIntervalTree(balance="scapegoat", alpha=1)
+
+
+    @staticmethod
+    def height(root):
+        levels = 0
+        level = [root] if root is not None else []
+        while level:
+            levels += 1
+            level = [child for node in level for child in (node.left, node.right) if child is not None]
+        return levels
+
+
+    def test_find_all_overlapping(self):
+        random.seed(7)
+        intervals = []
+        for _ in range(300):
+            low = random.randint(0, 1000)
+            intervals.append(Interval(low, low + random.randint(0, 60)))
+
+        trees = [UnbalancedIntervalTree(), BalancedIntervalTree(), BalancedIntervalTree(balance="avl")]
+        for tree in trees:
+            for interval in intervals:
+                tree.insert(interval)
+
+        for _ in range(100):
+            low = random.randint(-50, 1050)
+            query = Interval(low, low + random.randint(0, 40))
+            expected = sorted((iv.low, iv.high) for iv in intervals if iv.low <= query.high and query.low <= iv.high)
+            for tree in trees:
+                result = [(iv.low, iv.high) for iv in tree.find_all_overlapping(query)]
+                self.assertEqual(sorted(result), expected)
+                self.assertEqual([low for low, _ in result], sorted(low for low, _ in result))
+
+        self.assertEqual(list(BalancedIntervalTree().find_all_overlapping(Interval(1, 2))), [])
+
+
+    def test_freeze(self):
+        frozen = self.idx.freeze()
+        in_order_result = []
+        self.idx.inOrderTraversal(self.idx.root, in_order_result)
+
+        offsets, ids = frozen.query_many([13, 36], [14, 40])
+        self.assertEqual([in_order_result[i] for i in sorted(ids[offsets[0]:offsets[1]])],
+                         [Interval(5, 20), Interval(10, 30), Interval(12, 15)])
+        self.assertEqual([in_order_result[i] for i in ids[offsets[1]:offsets[2]]], [Interval(30, 40)])
+
+
+    def test_from_arrays(self):
+        idx = BalancedIntervalTree.from_arrays([interval.low for interval in self.intervals],
+                                               [interval.high for interval in self.intervals])
+        offsets, ids = idx.query_many([36], [40])
+        self.assertEqual(list(ids), [5])
+
+
+    def check_max(self, node):
+        """ Returns the highest live high in the subtree and checks every max on the way. """
+        if node is None:
+            return float("-inf")
+        expected = max(node.interval.high if not getattr(node, "deleted", False) else float("-inf"),
+                       self.check_max(node.left), self.check_max(node.right))
+        self.assertEqual(node.max, expected)
+        return expected
+
+
+    def test_delete_and_update(self):
+        random.seed(5)
+        trees = [UnbalancedIntervalTree(), BalancedIntervalTree(), BalancedIntervalTree(balance="avl"),
+                 BalancedIntervalTree(tombstones=True, tombstone_threshold=0.3)]
+        live = []
+        for step in range(600):
+            if live and random.random() < 0.4:
+                interval = random.choice(live)
+                live.remove(interval)
+                if random.random() < 0.5:
+                    for tree in trees:
+                        self.assertTrue(tree.delete(Interval(interval.low, interval.high)))
+                else:
+                    low = random.randint(0, 200)
+                    new_interval = Interval(low, low + random.randint(0, 20))
+                    live.append(new_interval)
+                    for tree in trees:
+                        self.assertTrue(tree.update(Interval(interval.low, interval.high), new_interval))
+            else:
+                low = random.randint(0, 200)
+                interval = Interval(low, low + random.randint(0, 20))
+                live.append(interval)
+                for tree in trees:
+                    tree.insert(interval)
+
+            if step % 50 == 0:
+                query = Interval(random.randint(0, 200), random.randint(200, 230))
+                expected = sorted((iv.low, iv.high) for iv in live if iv.low <= query.high and query.low <= iv.high)
+                for tree in trees:
+                    self.check_max(tree.root)
+                    self.assertEqual(sorted((iv.low, iv.high) for iv in tree.find_all_overlapping(query)), expected)
+
+        for tree in trees:
+            self.assertFalse(tree.delete(Interval(-5, -1)))
+            self.assertFalse(tree.update(Interval(-5, -1), Interval(1, 2)))
+
+        # Deleting everything leaves an empty tree
+        for interval in live:
+            for tree in trees:
+                self.assertTrue(tree.delete(interval))
+        for tree in trees:
+            self.assertEqual(list(tree.find_all_overlapping(Interval(-1000, 1000))), [])
+            self.assertIsNone(tree.isOverlapping(tree.root, Interval(-1000, 1000)))
+
+
+    def test_tombstone_partial_rebuild(self):
+        tree = BalancedIntervalTree(tombstones=True, tombstone_threshold=0.5)
+        intervals = [Interval(low, low + 2) for low in range(64)]
+        tree.root = tree.buildBalancedTree(intervals, start=0, end=len(intervals) - 1)
+
+        # Tombstones in the left part only rebuild a subtree on the left, the root stays in place
+        root = tree.root
+        for interval in intervals[:10]:
+            self.assertTrue(tree.delete(interval))
+        self.assertIs(tree.root, root)
+        self.assertLessEqual(tree.root.dead, 5)
+        self.assertEqual(tree.root.size - tree.root.dead, 54)
+        self.assertIsNone(tree.isOverlapping(tree.root, Interval(0, 8)))
+        self.assertEqual(tree.isOverlapping(tree.root, Interval(0, 10)), Interval(10, 12))
+
+        with self.assertRaises(ValueError):
+            BalancedIntervalTree(balance="avl", tombstones=True)
+
+
+    def test_count_overlapping(self):
+        self.assertEqual(self.idx.count_overlapping(Interval(13, 14)), 3)
+        self.assertEqual(self.idx.count_overlapping(Interval(41, 50)), 0)
+        self.assertEqual(self.idx.count_many([Interval(18, 25), Interval(0, 100)]), [4, 6])
+
+        # The endpoint lists follow inserts, deletes and direct root assignments
+        self.idx.insert(Interval(13, 13))
+        self.assertEqual(self.idx.count_overlapping(Interval(13, 14)), 4)
+        self.idx.delete(Interval(10, 30))
+        self.assertEqual(self.idx.count_overlapping(Interval(13, 14)), 3)
+        self.idx.root = self.idx.buildBalancedTree([Interval(1, 2)], 0, 0)
+        self.assertEqual(self.idx.count_overlapping(Interval(13, 14)), 0)
+
+
+    def test_count_overlapping_incremental(self):
+        random.seed(9)
+        for tree in (BalancedIntervalTree(), BalancedIntervalTree(balance="avl"),
+                     BalancedIntervalTree(balance="scapegoat", tombstones=True)):
+            live = []
+            tree.count_overlapping(Interval(0, 0))
+            highs = tree._sortedHighs()
+            for step in range(400):
+                if live and random.random() < 0.4:
+                    interval = live.pop(random.randrange(len(live)))
+                    if random.random() < 0.5:
+                        self.assertTrue(tree.delete(interval))
+                    else:
+                        low = random.randint(0, 100)
+                        live.append(Interval(low, low + random.randint(0, 10)))
+                        self.assertTrue(tree.update(interval, live[-1]))
+                else:
+                    low = random.randint(0, 100)
+                    live.append(Interval(low, low + random.randint(0, 10)))
+                    tree.insert(live[-1])
+                query = Interval(random.randint(0, 100), random.randint(100, 110))
+                expected = sum(1 for iv in live if iv.low <= query.high and query.low <= iv.high)
+                self.assertEqual(tree.count_overlapping(query), expected)
+
+            # The BTree of highs was kept up to date, never rebuilt
+            self.assertIs(tree._sortedHighs(), highs)
+            self.assertEqual([high for high, _ in highs.items()], sorted(iv.high for iv in live))
+            queries = [Interval(low, low + 5) for low in range(-5, 115, 3)]
+            self.assertEqual(tree.count_many(queries),
+                             [sum(1 for iv in live if iv.low <= q.high and q.low <= iv.high) for q in queries])
+
+
+    def test_stab_many(self):
+        days = [25, 0, 17, 40, 17, 41]
+        result = list(self.idx.stab_many(days))
+        self.assertEqual([day for day, _ in result], sorted(days))
+        for day, active in result:
+            expected = sorted((iv.low, iv.high) for iv in self.intervals if iv.low <= day <= iv.high)
+            self.assertEqual(sorted((iv.low, iv.high) for iv in active), expected)
+
+
+    def test_query_cache(self):
+        tree = BalancedIntervalTree(balance="avl", cache_size=2)
+        for interval in self.intervals:
+            tree.insert(interval)
+
+        self.assertEqual(tree.count_overlapping(Interval(13, 14)), 3)
+        self.assertEqual(tree.count_overlapping(Interval(13, 14)), 3)
+        self.assertIsNotNone(tree.isOverlapping(tree.root, Interval(36, 40)))
+        self.assertIsNone(tree.isOverlapping(tree.root, Interval(41, 50)))
+        self.assertIsNone(tree.isOverlapping(tree.root, Interval(41, 50)))
+        stats = tree.cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["evictions"], stats["size"]), (2, 3, 1, 2))
+
+        # Any change to the tree invalidates the cached answers
+        tree.insert(Interval(45, 46))
+        self.assertEqual(tree.isOverlapping(tree.root, Interval(41, 50)), Interval(45, 46))
+        tree.delete(Interval(45, 46))
+        self.assertIsNone(tree.isOverlapping(tree.root, Interval(41, 50)))
+        tree.root = tree.rebuildTree(tree.root)
+        self.assertEqual(tree.count_overlapping(Interval(13, 14)), 3)
+        self.assertEqual(tree.cache.stats()["hits"], 2)
 
 
-if __name__ == "__main__":
-    unittest.main()
 
 
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,218 @@
+import sys
+sys.path.append('../')
+
+
+import os
+import random
+import tempfile
+import unittest
+from src.BTree_Paged import PagedBTree
+
+
+
+class TestPagedBTree(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "tree.pages")
+        # Small pages and a tiny buffer pool, so that nodes are evicted and read back all the time
+        self.btree = PagedBTree(self.path, min_degree=3, page_size=256, cache_pages=4)
+        self.keys = list(range(500))
+        random.seed(6)
+        random.shuffle(self.keys)
+        for key in self.keys:
+            self.btree.insert((key, 3 * key))
+
+    def tearDown(self):
+        self.btree.close()
+        self.directory.cleanup()
+
+
+    def check_invariants(self, node, low=None, high=None, is_root=True):
+        """ Returns the height of the subtree and checks the B-tree invariants on the way. """
+        keys = node.keys
+        self.assertEqual(keys, sorted(keys))
+        self.assertLessEqual(len(keys), self.btree.MAX_KEYS)
+        if not is_root:
+            self.assertGreaterEqual(len(keys), self.btree.MIN_KEYS)
+        if keys and low is not None:
+            self.assertGreater(keys[0], low)
+        if keys and high is not None:
+            self.assertLess(keys[-1], high)
+        if node.is_leaf:
+            return 1
+
+        self.assertEqual(len(node.children), len(keys) + 1)
+        bounds = [low] + keys + [high]
+        heights = {self.check_invariants(self.btree.child(node, i), bounds[i], bounds[i + 1], False)
+                   for i in range(len(node.children))}
+        self.assertEqual(len(heights), 1)
+        return heights.pop() + 1
+
+
+    def test_insert_search_and_pool_size(self):
+        self.assertLessEqual(len(self.btree.cache), self.btree.cache_pages)
+        for key in range(500):
+            node, index = self.btree.search(key)
+            self.assertEqual(node.values[index], 3 * key)
+        self.assertIsNone(self.btree.search(500))
+        self.assertLessEqual(len(self.btree.cache), self.btree.cache_pages)
+        found = self.btree.search_many(range(-5, 505))
+        self.assertEqual([node.values[index] for node, index in found[5:505]], [3 * key for key in range(500)])
+        self.assertEqual(found[:5] + found[505:], [None] * 10)
+        self.assertLessEqual(len(self.btree.cache), self.btree.cache_pages)
+        self.assertEqual(list(self.btree.range(100, 103)), [(100, 300), (101, 303), (102, 306), (103, 309)])
+        self.check_invariants(self.btree.root)
+
+
+    def test_reopen(self):
+        self.btree.close()
+        self.btree = PagedBTree(self.path, cache_pages=4)
+        self.assertEqual(self.btree.min_degree, 3)
+        self.assertEqual(self.btree.page_size, 256)
+        self.assertEqual(len(self.btree.cache), 0)     # opening reads nothing but the meta page
+        self.assertEqual(list(self.btree.items()), [(key, 3 * key) for key in range(500)])
+
+        with self.assertRaises(ValueError):
+            PagedBTree(self.path, min_degree=4)
+
+
+    def test_rejected_keys(self):
+        # Keys and values must be 64-bit integers; a rejected one leaves the tree as it was and savable
+        for item in [(2 ** 70, 1), (1.5, 2), (7, 2 ** 63), (8, "x")]:
+            with self.assertRaises(ValueError):
+                self.btree.insert(item)
+        with self.assertRaises(ValueError):
+            self.btree.delete(2.0)
+        self.assertIsNotNone(self.btree.search(2))
+        self.btree.checkpoint()
+        self.btree.close()
+
+        self.btree = PagedBTree(self.path, cache_pages=4)
+        self.assertEqual(list(self.btree.items()), [(key, 3 * key) for key in range(500)])
+
+
+    def test_delete_reuses_pages(self):
+        for key in self.keys[:400]:
+            self.assertTrue(self.btree.delete(key))
+        self.assertFalse(self.btree.delete(self.keys[0]))
+        self.check_invariants(self.btree.root)
+        page_count = self.btree.page_count
+
+        # The merged-away pages went to the free list: inserting them back does not grow the file
+        for key in self.keys[:400]:
+            self.btree.insert((key, 3 * key))
+        self.assertEqual(self.btree.page_count, page_count)
+
+        self.btree.close()
+        self.btree = PagedBTree(self.path, cache_pages=4)
+        self.check_invariants(self.btree.root)
+        self.assertEqual([key for key, _ in self.btree.items()], list(range(500)))
+
+
+    def test_bulk_load(self):
+        page_count = self.btree.page_count
+        self.btree.bulk_load(((key, -key) for key in range(1000)), fill_factor=0.5)
+        self.check_invariants(self.btree.root)
+        self.btree.close()
+
+        self.btree = PagedBTree(self.path, cache_pages=4)
+        self.assertEqual(list(self.btree.items()), [(key, -key) for key in range(1000)])
+        self.assertGreater(self.btree.page_count, page_count)
+        self.assertNotEqual(self.btree.free_head, -1)   # the pages of the old tree are free
+
+
+    def test_bulk_load_keeps_the_pool_bounded(self):
+        most_dirty = 0
+        new_node = self.btree.newNode
+
+        def counting_new_node(is_leaf):
+            nonlocal most_dirty
+            most_dirty = max(most_dirty, len(self.btree.dirty_pages))
+            return new_node(is_leaf)
+
+        self.btree.newNode = counting_new_node
+        self.btree.bulk_load((key, key) for key in range(20000))
+        self.assertLessEqual(most_dirty, self.btree.cache_pages + 1)
+        self.assertLessEqual(len(self.btree.dirty_pages) + len(self.btree.cache), self.btree.cache_pages)
+        self.check_invariants(self.btree.root)
+        self.assertEqual(self.btree.search_many([0, 12345, 19999, 20000])[3], None)
+
+        # A rejected item stops the load before anything is published; the old content is still there
+        with self.assertRaises(ValueError):
+            self.btree.bulk_load([(1, 1), (2, 2 ** 64)])
+        self.btree.close()
+        self.btree = PagedBTree(self.path, cache_pages=4)
+        self.assertEqual(list(self.btree.items()), [(key, key) for key in range(20000)])
+
+
+    def crash(self):
+        """ Drop the tree without a checkpoint, as if the process died. """
+        self.btree._map.close()
+        self.btree._file.close()
+        self.btree._log.close()
+
+
+    def test_checkpoint_writes_only_dirty_pages(self):
+        self.btree.checkpoint()
+        self.assertEqual(self.btree.checkpoint(), 0)
+        self.btree.insert((1000, 1))
+        self.assertLessEqual(self.btree.checkpoint(), 3)    # the leaf, maybe a split sibling and the parent
+        self.assertGreater(self.btree.page_count, 100)
+        self.assertEqual(os.path.getsize(self.path + ".wal"), 0)
+
+
+    def test_recovery_replays_committed_operations(self):
+        # A pool large enough for all the dirty pages, so that no checkpoint is taken before the crash
+        self.btree.close()
+        self.btree = PagedBTree(self.path, cache_pages=1000, group_commit=10)
+        for key in range(500, 525):
+            self.btree.insert((key, 3 * key))
+        for key in range(0, 20):
+            self.btree.delete(key)
+        self.assertGreater(os.path.getsize(self.path + ".wal"), 0)
+        self.btree.commit()
+        self.btree.insert((9999, 1))       # not committed: lost in the crash
+        self.crash()
+
+        self.btree = PagedBTree(self.path, cache_pages=4)
+        self.assertEqual([key for key, _ in self.btree.items()], list(range(20, 525)))
+        self.check_invariants(self.btree.root)
+        self.assertEqual(os.path.getsize(self.path + ".wal"), 0)
+
+
+    def test_recovery_after_crash_during_checkpoint(self):
+        self.btree.close()
+        self.btree = PagedBTree(self.path, cache_pages=1000)
+        for key in self.keys[:300]:
+            self.btree.delete(key)
+
+        def write_some_pages(page_id, data, written=[]):
+            if len(written) == 3:
+                raise OSError("crash")
+            written.append(page_id)
+            PagedBTree.writePage(self.btree, page_id, data)
+
+        self.btree.writePage = write_some_pages
+        with self.assertRaises(OSError):
+            self.btree.checkpoint()
+        self.crash()
+
+        # A torn record at the end of the log is ignored
+        with open(self.path + ".wal", "ab") as log:
+            log.write(b"\x01\x10\x00")
+
+        self.btree = PagedBTree(self.path, cache_pages=4)
+        self.assertEqual([key for key, _ in self.btree.items()], sorted(self.keys[300:]))
+        self.check_invariants(self.btree.root)
+
+
+    def test_page_size_limits_degree(self):
+        with self.assertRaises(ValueError):
+            PagedBTree(os.path.join(self.directory.name, "other.pages"), min_degree=6, page_size=256)
+        with PagedBTree(os.path.join(self.directory.name, "default.pages")) as btree:
+            self.assertEqual(btree.min_degree, PagedBTree.maxDegree(4096))
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,85 @@
+import sys
+sys.path.append('../')
+
+
+import unittest
+from multiprocessing import shared_memory
+from unittest import mock
+import numpy as np
+from src import IntervalTree_parallel
+from src.IntervalTree_array import ArrayIntervalTree
+from src.IntervalTree_parallel import ParallelQueryExecutor
+
+
+
+class TestParallelQueryExecutor(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        lows = rng.integers(0, 1000, 2000)
+        self.idx = ArrayIntervalTree.from_arrays(lows, lows + rng.integers(0, 20, 2000))
+        self.query_lows = rng.integers(0, 1000, 500)
+        self.query_highs = self.query_lows + 15
+
+
+    def test_matches_single_process(self):
+        expected_offsets, expected_ids = self.idx.query_many(self.query_lows, self.query_highs)
+        with ParallelQueryExecutor(self.idx, processes=2, chunk_size=64) as executor:
+            offsets, ids = executor.query_many(self.query_lows, self.query_highs)
+            counts = executor.count_many(self.query_lows, self.query_highs)
+
+        self.assertEqual(list(offsets), list(expected_offsets))
+        for j in range(len(self.query_lows)):
+            self.assertEqual(sorted(ids[offsets[j]:offsets[j + 1]]),
+                             sorted(expected_ids[expected_offsets[j]:expected_offsets[j + 1]]))
+        self.assertEqual(list(counts), list(np.diff(expected_offsets)))
+
+
+    def test_workers_share_the_sorted_endpoints(self):
+        # What a worker does when it starts, run here: its tree counts from the shared endpoints without sorting
+        layouts = []
+        start_pool = IntervalTree_parallel.Pool
+
+        def recording_pool(processes, initializer, initargs):
+            layouts.append(initargs[0])
+            return start_pool(processes, initializer=initializer, initargs=initargs)
+
+        with mock.patch.object(IntervalTree_parallel, "Pool", recording_pool):
+            with ParallelQueryExecutor(self.idx, processes=1) as executor:
+                IntervalTree_parallel._attachWorker(layouts[0])
+                expected = self.idx.count_many(self.query_lows, self.query_highs)
+                with mock.patch.object(np, "sort", side_effect=AssertionError("a worker sorted the endpoints")):
+                    counts = IntervalTree_parallel._countChunk((self.query_lows, self.query_highs))
+                self.assertEqual(list(counts), list(expected))
+                IntervalTree_parallel._worker_tree = None
+                for block in IntervalTree_parallel._worker_blocks:
+                    block.close()
+
+
+    def test_failed_start_releases_shared_memory(self):
+        names = []
+
+        def failing_pool(processes, initializer, initargs):
+            names.extend(name for name, _, _ in initargs[0])
+            raise OSError("no processes")
+
+        executor = ParallelQueryExecutor(self.idx, processes=1)
+        with mock.patch.object(IntervalTree_parallel, "Pool", failing_pool):
+            with self.assertRaises(OSError):
+                executor.start()
+        self.assertEqual(executor.blocks, [])
+        self.assertEqual(len(names), 6)
+        for name in names:
+            with self.assertRaises(FileNotFoundError):
+                shared_memory.SharedMemory(name=name)
+
+
+    def test_no_queries(self):
+        with ParallelQueryExecutor(self.idx, processes=1) as executor:
+            offsets, ids = executor.query_many([], [])
+        self.assertEqual(list(offsets), [0])
+        self.assertEqual(len(ids), 0)
+
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import sys
+sys.path.append('../')
+
+
+import random
+import unittest
+from src.BanalancedTerbaryTree import Tree, Interval
+
+
+
+class TestTernaryTree(unittest.TestCase):
+    def setUp(self):
+        random.seed(11)
+        self.intervals = []
+        for _ in range(400):
+            low = random.randint(0, 1000)
+            self.intervals.append(Interval(low, low + random.randint(0, 50)))
+        self.idx = Tree(max_entries=3)
+        self.idx.buildBalancedTree(list(self.intervals))
+
+
+    def brute_force(self, low, high):
+        return sorted((interval.low, interval.high) for interval in self.intervals
+                      if interval.low <= high and low <= interval.high)
+
+
+    def test_build_in_place(self):
+        intervals = list(self.intervals)
+        tree = Tree(max_entries=5)
+        tree.buildBalancedTree(intervals)
+        self.assertIs(tree.intervals, intervals)
+
+        # Node ranges are sorted by low and together cover every interval exactly once
+        covered = []
+        stack = [tree.root]
+        while stack:
+            node = stack.pop()
+            bucket = intervals[node.start:node.end + 1]
+            self.assertEqual([iv.low for iv in bucket], sorted(iv.low for iv in bucket))
+            covered.extend(range(node.start, node.end + 1))
+            if node.isLeaf():
+                self.assertLessEqual(len(bucket), tree.max_entries)
+            else:
+                self.assertTrue(all(iv.low <= node.center <= iv.high for iv in bucket))
+                self.assertEqual(node.by_high, sorted(bucket, key=lambda iv: iv.high, reverse=True))
+                stack.extend(child for child in (node.left, node.right) if child is not None)
+        self.assertEqual(sorted(covered), list(range(len(intervals))))
+
+
+    def test_search(self):
+        for _ in range(200):
+            low = random.randint(-20, 1070)
+            high = low + random.randint(0, 30)
+            result = self.idx.search(Interval(low, high))
+            self.assertEqual(sorted((interval.low, interval.high) for interval in result), self.brute_force(low, high))
+
+
+    def test_stab(self):
+        for point in range(0, 1050, 7):
+            result = self.idx.stab(point)
+            self.assertEqual(sorted((interval.low, interval.high) for interval in result), self.brute_force(point, point))
+
+
+    def test_nested_intervals(self):
+        # Every interval overlaps every other one: they all stay at nodes (sorted), no bucket outgrows max_entries
+        tree = Tree(max_entries=2)
+        tree.buildBalancedTree([Interval(i, 2000 - i) for i in range(1000)])
+        stack = [tree.root]
+        while stack:
+            node = stack.pop()
+            if node.isLeaf():
+                self.assertLessEqual(node.end - node.start + 1, 2)
+            else:
+                stack.extend(child for child in (node.left, node.right) if child is not None)
+        self.assertEqual(len(tree.stab(1000)), 1000)
+        self.assertEqual(tree.search(Interval(0, 0))[0].low, 0)
+        self.assertEqual(len(tree.search(Interval(0, 0))), 1)
+        self.assertEqual(sorted(iv.low for iv in tree.search(Interval(1995, 3000))), [0, 1, 2, 3, 4, 5])
+
+
+    def test_empty_tree(self):
+        self.assertEqual(Tree(max_entries=4).search(Interval(1, 2)), [])
+
+
+    def test_tune_max_entries(self):
+        queries = [Interval(low, low + 10) for low in range(0, 1000, 50)]
+        timings = self.idx.tuneMaxEntries(list(self.intervals), queries, candidates=(2, 8, 32))
+        self.assertEqual(sorted(timings), [2, 8, 32])
+        self.assertEqual(self.idx.max_entries, min(timings, key=timings.get))
+        self.assertEqual(len(self.idx.stab(500)), len(self.brute_force(500, 500)))
+
+
+
+if __name__ == "__main__":
+    unittest.main()